@@ -0,0 +1,76 @@
+"""
+    Benchmark da parametrização de ΔU (blocos de movimento e Laguerre).
+
+    Compara o DMPC com N_c = 20 movimentos livres por entrada com as bases
+    de basis.py em uma planta 2x2, em malha fechada com restrições em Δu e
+    u (simulate). Para cada caso mostra o número de variáveis de decisão,
+    o número de linhas do QP dual após a redução de M L, o tempo de
+    montagem, o tempo médio por amostra, as iterações de Hildreth e o erro
+    quadrático de seguimento.
+
+    O tamanho do dual de Hildreth é o número de restrições: a base reduz a
+    hessiana e os ganhos, e o QP diminui quando as restrições também são
+    poucas (apply='first' ou um inteiro) ou quando M L tem linhas repetidas
+    (blocos de movimento). Com mais restrições do que coeficientes, H =
+    M E^-1 M' é singular e Hildreth converge mais devagar.
+
+    Uso: python benchmarks/bench_basis.py
+"""
+
+import os
+import sys
+import time
+import timeit
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from mpc import (augmented_system, constraint_matrices, DMPC, DMPCSolver, laguerre, move_blocking,
+                 simulate, clear_gain_cache)
+
+N_P, N_C, M_ENTRADAS = 60, 20, 2
+K_TOTAL = 150
+
+
+def planta():
+    A_m = np.array([[0.90, 0.05], [0.02, 0.85]])
+    B_m = np.array([[0.10, 0.02], [0.01, 0.08]])
+    return augmented_system(A_m, B_m, np.eye(2))
+
+
+def main():
+    A, B, C = planta()
+    r = np.zeros((K_TOTAL, 2))
+    r[10:] = [1.0, -0.5]
+    r[80:] = [0.3, 0.6]
+
+    bases = [
+        ("N_c = 20", None),
+        ("blocos 1,1,2,4,12", move_blocking(N_C, (1, 1, 2, 4, 12), M_ENTRADAS)),
+        ("Laguerre a=0.6 N=3", laguerre(N_C, 0.6, 3, M_ENTRADAS)),
+    ]
+    simulate(A, B, C, N_P, N_C, 0.1, r[:5], 5,                 # aquecimento (imports, caches)
+             constraints=constraint_matrices(N_C, (-0.1, 0.1), (-1.5, 1.5), m=M_ENTRADAS))
+    print(f"{'base':>20} {'restr.':>6} | {'n_η':>4} {'dual':>5} | {'montagem':>9} {'por amostra':>12} |"
+          f" {'iter. méd':>9} {'máx':>4} | {'erro':>7}")
+    for apply in ('first', 5, 'all'):
+        restricoes = constraint_matrices(N_C, (-0.1, 0.1), (-1.5, 1.5), m=M_ENTRADAS, apply=apply)
+        for nome, L in bases:
+            t_montagem = min(timeit.repeat(lambda: DMPC(A, B, C, N_P, N_C, 0.1, basis=L),
+                                           number=1, repeat=5))
+            dmpc = DMPC(A, B, C, N_P, N_C, 0.1, basis=L)
+            dual = DMPCSolver(dmpc, restricoes[0]).hildreth.M.shape[0]
+
+            clear_gain_cache()
+            t = time.perf_counter()
+            res = simulate(A, B, C, N_P, N_C, 0.1, r, K_TOTAL, constraints=restricoes, p_max=500,
+                           basis=L)
+            t = (time.perf_counter() - t) / K_TOTAL
+            erro = np.sum((res.y[0] - r) ** 2)
+            print(f"{nome:>20} {str(apply):>6} | {dmpc.Phi.shape[1]:4d} {dual:5d} |"
+                  f" {1e3 * t_montagem:7.2f}ms {1e3 * t:10.3f}ms | {res.iterations.mean():9.1f}"
+                  f" {res.iterations.max():4d} | {erro:7.3f}")
+
+
+if __name__ == "__main__":
+    main()
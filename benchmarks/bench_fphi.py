@@ -0,0 +1,62 @@
+"""
+    Benchmark da construção das matrizes de predição F e Phi.
+
+    Compara mpc.compute_FPhi (sequência C A^k compartilhada) com a versão
+    original baseada em linalg.matrix_power para cada elemento.
+
+    Uso: python benchmarks/bench_fphi.py
+"""
+
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from mpc import augmented_system, compute_FPhi
+
+
+def compute_FPhi_loop(A, B, C, N_p, N_c):
+    """Implementação original (SISO), mantida apenas como referência."""
+    n = A.shape[0]
+    F = np.zeros((N_p, n))
+    Phi = np.zeros((N_p, N_c))
+
+    for i in range(0, N_p):
+        F[i] = C @ np.linalg.matrix_power(A, i + 1)
+        temp = np.zeros((1, N_c))
+        for c in range(0, N_c):
+            if c > i:
+                break
+            temp[:, c] = C @ np.linalg.matrix_power(A, i - c) @ B
+        Phi[i] = temp
+    return F, Phi
+
+
+def modelo_teste():
+    """Modelo de 3ª ordem usado em lista_mpc.ipynb, já aumentado."""
+    Am = np.array([[1.0, 0.5, 0], [0, 1.0, -0.1], [0, 0, 0.8]])
+    Bm = np.array([[0.5], [1], [-0.6]])
+    Cm = np.array([[1, 0, 1]])
+    return augmented_system(Am, Bm, Cm)
+
+
+def main(repeticoes=5):
+    A, B, C = modelo_teste()
+    print(f"{'N_p':>5} {'N_c':>5} {'loop [ms]':>12} {'recursivo [ms]':>15} {'ganho':>8}")
+    for N_p in [10, 60, 100, 250, 500]:
+        N_c = max(1, N_p // 3)
+        F_ref, Phi_ref = compute_FPhi_loop(A, B, C, N_p, N_c)
+        F, Phi = compute_FPhi(A, B, C, N_p, N_c)
+        assert np.allclose(F, F_ref) and np.allclose(Phi, Phi_ref)
+
+        t_loop = min(timeit.repeat(lambda: compute_FPhi_loop(A, B, C, N_p, N_c),
+                                   number=1, repeat=repeticoes))
+        t_rec = min(timeit.repeat(lambda: compute_FPhi(A, B, C, N_p, N_c),
+                                  number=1, repeat=repeticoes))
+        print(f"{N_p:5d} {N_c:5d} {1e3*t_loop:12.3f} {1e3*t_rec:15.3f} {t_loop/t_rec:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+    Benchmark do método de Hildreth.
+
+    Compara a implementação de hilbreth.ipynb (laços Python aninhados, H
+    recalculada a cada chamada) com mpc.HildrethSolver (H em cache, varredura
+    vetorizada e warm start) em um DMPC com restrições em Δu e u ao longo de
+    todo o horizonte de controle, variando o número de restrições.
+
+    Uso: python benchmarks/bench_hildreth.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from mpc import augmented_system, compute_FPhi, HildrethSolver
+
+
+def HildrethIteration(A, b, lambda_old):
+    n = len(lambda_old)
+    lambda_new = np.zeros((n, 1))
+    for i in range(0, n):
+        w = 0
+        for j in range(0, i):
+            w += A[i, j] * lambda_new[j]
+        for j in range(i+1, n):
+            w += A[i, j] * lambda_old[j]
+        w += b[i]
+        w = - w / A[i, i]
+        lambda_new[i] = max(0, w)
+    return lambda_new
+
+
+def HildrethQP_notebook(C, d, G, h, p_max=10):
+    """Versão original de hilbreth.ipynb, mantida como referência."""
+    inv = np.linalg.inv
+    x_opt = - inv(C) @ d
+    if np.all(G @ x_opt <= h):
+        return x_opt
+    H = G @ inv(C) @ G.T
+    K = (G @ inv(C) @ d) + h
+    n = H.shape[1]
+    lambda_p = np.zeros((n, 1))
+    for p in range(1, p_max):
+        lambda_pp = lambda_p
+        lambda_p = HildrethIteration(H, K, lambda_pp)
+        if np.all(abs(lambda_p - lambda_pp) < 1e-15):
+            break
+    return x_opt - inv(C) @ G.T @ lambda_p
+
+
+def restricoes(N_c, du_range, u_range):
+    """Restrições em Δu e u em todo o horizonte (gerarMatrizesRestricoes, apply='all')."""
+    I = np.eye(N_c)
+    T = np.tril(np.ones((N_c, N_c)))
+    M = np.vstack([I, -I, T, -T])
+    gamma0 = np.concatenate([np.full(N_c, du_range[1]), np.full(N_c, -du_range[0]),
+                             np.full(N_c, u_range[1]), np.full(N_c, -u_range[0])])
+    mascara = np.concatenate([np.zeros(2 * N_c), -np.ones(N_c), np.ones(N_c)])
+    return M, gamma0, mascara
+
+
+def simular(resolver, A, B, F, Phi, E, M, gamma0, mascara, k_total=20):
+    n = A.shape[0]
+    N_p = F.shape[0]
+    x = np.zeros((n, 1))
+    u = 0.0
+    f_r = -2 * Phi.T @ np.ones((N_p, 1))
+    f_x = 2 * Phi.T @ F
+    t0 = time.perf_counter()
+    for _ in range(k_total):
+        f = f_r + f_x @ x
+        gamma = (gamma0 + mascara * u).reshape(-1, 1)
+        du = resolver(E, f, M, gamma)[0, 0]
+        u += du
+        x = A @ x + B * du
+    return (time.perf_counter() - t0) / k_total, x
+
+
+def main():
+    Am = np.array([[0.9048, 0], [0.0952, 1]])
+    Bm = np.array([[0.0952], [0.0048]])
+    Cm = np.array([[0, 1]])
+    A, B, C = augmented_system(Am, Bm, Cm)
+    N_p, r_w = 60, 0.1
+
+    print(f"{'restrições':>10} {'notebook [ms]':>14} {'solver [ms]':>12} {'ganho':>8} {'iter. médias':>13} {'|Δx| final':>12}")
+    for N_c in [2, 5, 10, 20, 40]:
+        F, Phi = compute_FPhi(A, B, C, N_p, N_c)
+        E = 2 * (Phi.T @ Phi + r_w * np.eye(N_c))
+        M, gamma0, mascara = restricoes(N_c, (-0.2, 0.2), (0, 0.6))
+
+        t_nb, x_nb = simular(lambda E, f, M, g: HildrethQP_notebook(E, f, M, g, p_max=80),
+                             A, B, F, Phi, E, M, gamma0, mascara)
+
+        solver = HildrethSolver(E, M, p_max=80, tol=1e-15)
+        iteracoes = []
+
+        def resolver(E, f, M, gamma):
+            resultado = solver.solve(f, gamma)
+            iteracoes.append(resultado.iterations)
+            return resultado.x
+
+        t_sv, x_sv = simular(resolver, A, B, F, Phi, E, M, gamma0, mascara)
+        # com p_max limitado as duas versões podem parar em λ diferentes,
+        # já que o warm start parte de um λ mais próximo do ótimo
+        print(f"{M.shape[0]:10d} {1e3*t_nb:14.3f} {1e3*t_sv:12.3f} {t_nb/t_sv:7.1f}x "
+              f"{np.mean(iteracoes):13.1f} {np.abs(x_nb - x_sv).max():12.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+    Benchmark das formulações condensada e esparsa do DMPC.
+
+    Para cada combinação de dimensões mede o tempo de montagem do controlador
+    (ganhos Ky, Kx) nas duas formas, o tempo de uma trajetória ΔU e de um QP
+    com restrições em todo o horizonte (DMPCSolver), e mostra a escolha de
+    choose_formulation(). O ponto de troca aparece quando N_c m cresce em
+    relação a n: a forma condensada escala com (N_c m)^3 e a esparsa com
+    N_p (n + q)^3.
+
+    Uso: python benchmarks/bench_sparse.py
+"""
+
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from mpc import (augmented_system, constraint_matrices, choose_formulation, DMPC, DMPCSolver,
+                 SparseDMPC)
+
+
+def modelo_zonas(zonas, ordem=2, seed=0):
+    """Planta térmica com 'zonas' entradas/saídas acopladas, 'ordem' estados por zona, já aumentada."""
+    rng = np.random.default_rng(seed)
+    n = zonas * ordem
+    A = np.diag(rng.uniform(0.90, 0.98, n)) + 0.01 * rng.random((n, n))
+    A /= max(1.0, 1.01 * np.abs(np.linalg.eigvals(A)).max())
+    B = np.kron(np.eye(zonas), np.ones((ordem, 1))) * 0.1 + 0.01 * rng.random((n, zonas))
+    C = np.kron(np.eye(zonas), np.ones((1, ordem)) / ordem)
+    return augmented_system(A, B, C)
+
+
+def tempo(f, repeticoes):
+    return min(timeit.repeat(f, number=1, repeat=repeticoes))
+
+
+def main(repeticoes=3):
+    casos = [  # (zonas, ordem, N_p, N_c)
+        (1, 3, 60, 5), (2, 20, 60, 5), (2, 2, 60, 60), (4, 2, 60, 20),
+        (4, 2, 120, 60), (4, 2, 250, 125), (8, 2, 120, 60), (8, 2, 250, 125),
+        (4, 10, 250, 20), (16, 2, 100, 50),
+    ]
+    print(f"{'n':>4} {'m':>3} {'N_p':>5} {'N_c':>5} | {'montagem [ms]':^21} | {'ΔU [ms]':^17} |"
+          f" {'QP [ms]':^17} | {'auto':>9}")
+    print(f"{'':>20} | {'condens.':>10} {'esparsa':>10} | {'condens.':>8} {'esparsa':>8} |"
+          f" {'condens.':>8} {'esparsa':>8} |")
+    for zonas, ordem, N_p, N_c in casos:
+        A, B, C = modelo_zonas(zonas, ordem)
+        n, m, q = A.shape[0], B.shape[1], C.shape[0]
+
+        t_cond = tempo(lambda: DMPC(A, B, C, N_p, N_c, 0.1), repeticoes)
+        t_esp = tempo(lambda: SparseDMPC(A, B, C, N_p, N_c, 0.1), repeticoes)
+        cond, esp = DMPC(A, B, C, N_p, N_c, 0.1), SparseDMPC(A, B, C, N_p, N_c, 0.1)
+        assert np.allclose(cond.Kx, esp.Kx, atol=1e-8) and np.allclose(cond.Ky, esp.Ky, atol=1e-8)
+
+        x, r = np.zeros(n), np.ones(q)
+        t_dU_cond = tempo(lambda: cond.delta_U(x, r), 10 * repeticoes)
+        esp.delta_U(x, r)                          # fatora o KKT fora da medida
+        t_dU_esp = tempo(lambda: esp.delta_U(x, r), 10 * repeticoes)
+
+        M, gamma0, S = constraint_matrices(N_c, (-0.5, 0.5), (-2.0, 2.0), m=m, apply='all')
+        gamma = gamma0 + S @ np.zeros(m)
+        qp_cond, qp_esp = DMPCSolver(cond, M), DMPCSolver(esp, M)
+        t_qp_cond = tempo(lambda: qp_cond.solve(x, r, gamma), repeticoes)
+        t_qp_esp = tempo(lambda: qp_esp.solve(x, r, gamma), repeticoes)
+
+        escolha = choose_formulation(n, m, q, N_p, N_c)
+        melhor = 'condensed' if t_cond < t_esp else 'sparse'
+        marca = '' if escolha == melhor else ' *'
+        print(f"{n:4d} {m:3d} {N_p:5d} {N_c:5d} | {1e3*t_cond:10.2f} {1e3*t_esp:10.2f} |"
+              f" {1e3*t_dU_cond:8.3f} {1e3*t_dU_esp:8.3f} | {1e3*t_qp_cond:8.2f} {1e3*t_qp_esp:8.2f} |"
+              f" {escolha:>9}{marca}")
+    print("* escolha automática diferente da formulação mais rápida na montagem")
+
+
+if __name__ == "__main__":
+    main()
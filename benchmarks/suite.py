@@ -0,0 +1,296 @@
+"""
+    Suíte de benchmarks do núcleo do DMPC com verificação de regressões
+
+    Os benchmarks seguem o formato do asv: cada classe define params e
+    param_names, setup(*params) prepara os dados fora da medida e cada
+    método time_* é medido para todas as combinações de parâmetros. Os
+    modelos canônicos são a placa térmica (identificacao/foptd.py, sem e com
+    as cadeias de atraso de DelaySystem) e os tanques acoplados de
+    MPC_MIMO.ipynb; modelos sintéticos estáveis cobrem a dimensão do estado
+    e o número de entradas e saídas.
+
+    Cada medida é o menor tempo por chamada entre REPETICOES rodadas (cada
+    rodada com chamadas suficientes para durar ~TEMPO_RODADA). Com --save os
+    resultados são gravados em JSON junto com a identificação da máquina; com
+    --compare cada medida é comparada à linha de base; um benchmark acima do
+    limite é medido de novo (CONFIRMACOES vezes) e, se a lentidão se
+    confirma, o script termina com código 1 (razão > --threshold).
+    As linhas de base só são comparáveis na mesma máquina e ambiente.
+
+    Uso:
+        python benchmarks/suite.py                                  # roda e mostra
+        python benchmarks/suite.py --save benchmarks/baseline.json  # grava a linha de base
+        python benchmarks/suite.py --compare benchmarks/baseline.json --threshold 1.25
+        python benchmarks/suite.py -k FPhi --quick                  # filtra pelo nome
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import timeit
+
+import numpy as np
+import scipy
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(RAIZ)
+sys.path.append(os.path.join(RAIZ, 'identificacao'))
+from mpc import (augmented_system, discretize_system, compute_FPhi, get_controller, clear_gain_cache,
+                 constraint_matrices, DMPC, DMPCSolver, SparseDMPC, DelaySystem, simulate)
+from foptd import PLACA
+
+REPETICOES = 5
+TEMPO_RODADA = 0.05   # [s] duração mínima de cada rodada
+LIMITE = 1.25         # razão tempo / linha de base acima da qual há regressão
+CONFIRMACOES = 2      # novas medidas de um benchmark mais lento que o limite
+
+
+# --- modelos canônicos ---------------------------------------------------------
+
+def tanques():
+    """Tanques acoplados de MPC_MIMO.ipynb: (A, B, C) contínuo, 2 estados, 2 entradas, 2 saídas."""
+    T1, T2, K12, K1, K2 = 10.0, 15.0, 0.2, 1.0, 0.8
+    A = np.array([[-1 / T1, K12 / T1], [K12 / T2, -1 / T2]])
+    B = np.array([[K1 / T1, 0], [0, K2 / T2]])
+    return A, B, np.eye(2)
+
+
+def sintetico(n, m, q, seed=0):
+    """Modelo contínuo estável aleatório com n estados, m entradas e q saídas."""
+    rng = np.random.default_rng(seed)
+    A = rng.normal(size=(n, n)) / np.sqrt(n)
+    A -= (np.abs(np.linalg.eigvals(A).real).max() + 0.1) * np.eye(n)
+    return A, rng.normal(size=(n, m)), rng.normal(size=(q, n))
+
+
+def modelo(nome):
+    """Modelo aumentado (A, B, C) discreto de um dos fixtures canônicos."""
+    if nome == 'placa':
+        return augmented_system(*discretize_system(*PLACA.espaco_estados(), 2.0))
+    if nome == 'placa_atraso':
+        return augmented_system(*DelaySystem(*PLACA, T=2.0).matrices())
+    if nome == 'tanques':
+        return augmented_system(*discretize_system(*tanques(), 1.0))
+    raise ValueError(f"Modelo desconhecido: {nome}")
+
+
+MODELOS = ['placa', 'placa_atraso', 'tanques']
+
+
+# --- benchmarks -----------------------------------------------------------------
+
+class Discretize:
+    params = [[2, 8, 32], [1, 4]]
+    param_names = ['n', 'm']
+
+    def setup(self, n, m):
+        self.sistema = sintetico(n, m, m)
+
+    def time_discretize_system(self, n, m):
+        discretize_system(*self.sistema, 1.0)
+
+
+class Augmented:
+    params = [[2, 8, 32], [1, 4]]
+    param_names = ['n', 'm=q']
+
+    def setup(self, n, m):
+        A, B, C = sintetico(n, m, m)
+        self.discreto = discretize_system(A, B, C, 1.0)
+
+    def time_augmented_system(self, n, m):
+        augmented_system(*self.discreto)
+
+
+class FPhi:
+    params = [MODELOS, [60, 250], [5, 20]]
+    param_names = ['modelo', 'N_p', 'N_c']
+
+    def setup(self, nome, N_p, N_c):
+        self.sistema = modelo(nome)
+
+    def time_compute_FPhi(self, nome, N_p, N_c):
+        compute_FPhi(*self.sistema, N_p, N_c)
+
+
+class FPhiDimensoes:
+    params = [[4, 16, 64], [1, 4], [1, 4]]
+    param_names = ['n', 'm', 'q']
+
+    def setup(self, n, m, q):
+        A, B, C = sintetico(n, m, q)
+        self.sistema = augmented_system(*discretize_system(A, B, C, 1.0))
+
+    def time_compute_FPhi(self, n, m, q):
+        compute_FPhi(*self.sistema, 60, 10)
+
+
+class Gains:
+    params = [MODELOS, [60, 250], [5, 20], ['condensed', 'sparse']]
+    param_names = ['modelo', 'N_p', 'N_c', 'formulação']
+
+    def setup(self, nome, N_p, N_c, formulacao):
+        self.sistema = modelo(nome)
+        self.classe = SparseDMPC if formulacao == 'sparse' else DMPC
+
+    def time_controller(self, nome, N_p, N_c, formulacao):
+        self.classe(*self.sistema, N_p, N_c, 0.1)
+
+
+class Hildreth:
+    """QP do DMPC partindo de λ = 0, com 4 m N restrições (Δu e u nas N primeiras amostras)."""
+
+    params = [MODELOS, [5, 20], [1, 5, 20]]
+    param_names = ['modelo', 'N_c', 'N restrito']
+
+    def setup(self, nome, N_c, N):
+        if N > N_c:
+            raise NotImplementedError   # combinação sem sentido: pulada
+        A, B, C = modelo(nome)
+        m = B.shape[1]
+        dmpc = DMPC(A, B, C, 60, N_c, 0.1)
+        M, gamma0, S = constraint_matrices(N_c, (-1.0, 1.0), (0.0, 100.0), m=m, apply=N)
+        self.solver = DMPCSolver(dmpc, M, p_max=200)
+        # degrau grande na referência: várias restrições ativas
+        self.x = np.zeros(A.shape[0])
+        self.r = np.full(C.shape[0], 10.0)
+        self.gamma = gamma0 + S @ np.full(m, 50.0)
+
+    def time_solve(self, nome, N_c, N):
+        self.solver.reset()
+        self.solver.solve(self.x, self.r, self.gamma)
+
+
+class ClosedLoop:
+    """simulate() com 100 amostras e 4 cenários de r_w."""
+
+    params = [MODELOS, [5, 20], ['none', 'first']]
+    param_names = ['modelo', 'N_c', 'restrições']
+
+    def setup(self, nome, N_c, restricoes):
+        self.sistema = modelo(nome)
+        m, q = self.sistema[1].shape[1], self.sistema[2].shape[0]
+        self.r = np.ones((100, q))
+        self.restricoes = None
+        if restricoes != 'none':
+            self.restricoes = constraint_matrices(N_c, (-1.0, 1.0), (-2.0, 2.0), m=m, apply=restricoes)
+        for r_w in (0.1, 0.3, 1.0, 3.0):   # ganhos fora da medida
+            get_controller(*self.sistema, 60, N_c, r_w)
+
+    def time_simulate(self, nome, N_c, restricoes):
+        simulate(*self.sistema, 60, N_c, [0.1, 0.3, 1.0, 3.0], self.r, 100, constraints=self.restricoes)
+
+    def teardown(self, nome, N_c, restricoes):
+        clear_gain_cache()
+
+
+SUITE = [Discretize, Augmented, FPhi, FPhiDimensoes, Gains, Hildreth, ClosedLoop]
+
+
+# --- execução --------------------------------------------------------------------
+
+def _medir(f, repeticoes):
+    """Menor tempo por chamada entre as rodadas, com número de chamadas ajustado."""
+    temporizador = timeit.Timer(f)
+    n, t = temporizador.autorange()
+    n = max(1, int(n * TEMPO_RODADA / max(t, 1e-9)))
+    return min(temporizador.repeat(repeat=repeticoes, number=n)) / n
+
+
+def casos(filtro=None):
+    """Gera (nome, classe, params, método) de cada benchmark da suíte."""
+    for classe in SUITE:
+        metodos = sorted(nome for nome in dir(classe) if nome.startswith('time_'))
+        for params in itertools.product(*classe.params):
+            for metodo in metodos:
+                nome = f"{classe.__name__}.{metodo}({', '.join(map(str, params))})"
+                if not filtro or filtro in nome:
+                    yield nome, classe, params, metodo
+
+
+def executar(caso, repeticoes=REPETICOES):
+    """Segundos por chamada do benchmark, ou None se a combinação de parâmetros é pulada."""
+    _, classe, params, metodo = caso
+    bench = classe()
+    try:
+        bench.setup(*params)
+    except NotImplementedError:
+        return None
+    try:
+        return _medir(lambda: getattr(bench, metodo)(*params), repeticoes)
+    finally:
+        if hasattr(bench, 'teardown'):
+            bench.teardown(*params)
+
+
+def maquina():
+    return {'platform': platform.platform(), 'processor': platform.processor(),
+            'python': platform.python_version(), 'numpy': np.__version__, 'scipy': scipy.__version__}
+
+
+def _formatar(t):
+    for escala, unidade in ((1, 's'), (1e-3, 'ms'), (1e-6, 'µs')):
+        if t >= escala:
+            return f"{t / escala:8.3f} {unidade}"
+    return f"{t / 1e-9:8.1f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do núcleo do DMPC")
+    parser.add_argument('-k', dest='filtro', help="roda apenas os benchmarks cujo nome contém o texto")
+    parser.add_argument('--save', help="grava os resultados em JSON (linha de base)")
+    parser.add_argument('--compare', help="linha de base JSON para comparação")
+    parser.add_argument('--threshold', type=float, default=LIMITE,
+                        help=f"razão máxima tempo / linha de base (padrão {LIMITE})")
+    parser.add_argument('--quick', action='store_true', help="uma rodada por benchmark")
+    args = parser.parse_args(argv)
+
+    base = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            base = json.load(f)
+        if base['machine'] != maquina():
+            print("Aviso: a linha de base foi gravada em outra máquina/ambiente:", base['machine'])
+
+    repeticoes = 1 if args.quick else REPETICOES
+    resultados, regressoes = {}, []
+    for caso in casos(args.filtro):
+        nome = caso[0]
+        t = executar(caso, repeticoes)
+        if t is None:
+            continue
+        referencia = None if base is None else base['results'].get(nome)
+        # uma lentidão aparente é medida de novo antes de ser considerada regressão
+        for _ in range(CONFIRMACOES):
+            if referencia is None or t <= args.threshold * referencia:
+                break
+            t = min(t, executar(caso, repeticoes))
+        resultados[nome] = t
+        linha = f"{nome:<62} {_formatar(t)}"
+        if referencia is not None:
+            razao = t / referencia
+            linha += f"  {razao:6.2f}x"
+            if razao > args.threshold:
+                regressoes.append((nome, razao))
+                linha += "  REGRESSÃO"
+        print(linha, flush=True)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'machine': maquina(), 'results': resultados}, f, ensure_ascii=False, indent=1)
+            f.write("\n")
+        print(f"Resultados gravados em {args.save}")
+
+    if regressoes:
+        print(f"\n{len(regressoes)} benchmark(s) mais lentos que {args.threshold:.2f}x a linha de base:")
+        for nome, razao in regressoes:
+            print(f"  {nome}: {razao:.2f}x")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+    Modelo MIMO de primeira ordem com atraso (FOPTD) da placa térmica
+
+        G_ij(s) = K_ij / (1 + s tau_ij) e^(-theta_ij s)
+
+    FOPTD guarda as matrizes K, tau e theta (q x m, saída x entrada) e
+    converte o modelo para espaço de estados (um estado por canal, atrasos
+    desprezados) no formato aceito por mpc.discretize_system.
+
+    SimuladorFOPTD simula numericamente todos os canais: cada canal é
+    discretizado exatamente (segurador de ordem zero, atraso fracionário
+    pela transformada z modificada) e a recorrência de primeira ordem é
+    aplicada a sequências inteiras de MV com scipy.signal.lfilter.
+"""
+
+import os
+import sys
+from collections import namedtuple
+
+import numpy as np
+from scipy.signal import lfilter
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from mpc.delay import zoh_delay_coefficients
+
+# Modelo identificado (peltier_FOPTD.ipynb)
+GANHOS = np.array([[1.186, 0.83], [0.66, 2.36]])
+CONSTANTES = np.array([[99.36, 166.76], [124.76, 109.0]])
+ATRASOS = np.array([[12.58, 29.0], [48.0, 5.86]])
+
+
+class FOPTD(namedtuple("FOPTD", ["K", "tau", "theta"])):
+    """Parâmetros (K, tau, theta) de cada canal, em matrizes q x m."""
+
+    __slots__ = ()
+
+    def resposta_frequencia(self, w):
+        """G(jw) de todos os canais: formato (q, m, len(w))."""
+        K, tau, theta = (np.asarray(p, dtype=float)[..., None] for p in self)
+        jw = 1j * np.asarray(w, dtype=float)
+        return K * np.exp(-theta * jw) / (1 + tau * jw)
+
+    def espaco_estados(self):
+        """(A, B, C) contínuo com um estado por canal: y_i = sum_j x_ij.
+
+        O estado do canal (i, j) fica na posição i*m + j. Os atrasos são
+        desprezados; use mpc.discretize_system(A, B, C, Ts) para discretizar.
+        """
+        K = np.atleast_2d(np.asarray(self.K, dtype=float))
+        tau = np.atleast_2d(np.asarray(self.tau, dtype=float))
+        q, m = K.shape
+        canais = np.arange(q * m)
+        A = np.diag(-1.0 / tau.ravel())
+        B = np.zeros((q * m, m))
+        B[canais, canais % m] = (K / tau).ravel()
+        C = np.kron(np.eye(q), np.ones(m))
+        return A, B, C
+
+
+class SimuladorFOPTD:
+    """Simulação discreta exata de um modelo FOPTD MIMO com período Ts.
+
+    Cada canal segue x(k+1) = a x(k) + b0 u(k-d) + b1 u(k-d-1), com os
+    coeficientes de mpc.delay.zoh_delay_coefficients (os mesmos de
+    DelaySystem), e y_i = sum_j x_ij. As entradas passadas ficam em um
+    buffer de d_max + 2 amostras, compartilhado por todos os canais.
+    """
+
+    def __init__(self, modelo, Ts):
+        self.d, self.a, self.b0, self.b1 = zoh_delay_coefficients(*modelo, Ts)
+        self.q, self.m = self.d.shape
+        self.Ts = Ts
+        self._cols = np.broadcast_to(np.arange(self.m), (self.q, self.m))
+        self.reiniciar()
+
+    def reiniciar(self, x0=None, u0=0.0):
+        """Estado inicial: saídas dos canais x0 (q x m) e entradas passadas iguais a u0."""
+        self.x = np.zeros((self.q, self.m)) if x0 is None else np.array(x0, dtype=float)
+        # u_hist[j] = u(k - 1 - j)
+        self.u_hist = np.zeros((self.d.max() + 2, self.m)) + u0
+
+    def passo(self, u):
+        """Aplica u(k) durante um período; retorna y((k+1) Ts)."""
+        self.u_hist[1:] = self.u_hist[:-1]
+        self.u_hist[0] = u
+        self.x = (self.a * self.x + self.b0 * self.u_hist[self.d, self._cols]
+                  + self.b1 * self.u_hist[self.d + 1, self._cols])
+        return self.x.sum(axis=1)
+
+    def simular(self, u, canais=False):
+        """Aplica a sequência u (N x m) a partir do estado atual.
+
+        Retorna y (N x q), com y[n] = saída em (k + n + 1) Ts, ou as
+        contribuições de cada canal (N x q x m) com canais=True. Como em
+        passo, y está uma amostra à frente de u: para plotar os dois contra
+        t = k Ts + arange(N) Ts, use t + Ts para y. O estado final é mantido,
+        de modo que chamadas sucessivas continuam a simulação.
+        """
+        u = np.atleast_2d(np.asarray(u, dtype=float)).reshape(-1, self.m)
+        N, P = len(u), len(self.u_hist)
+        seq = np.concatenate([self.u_hist[::-1], u])        # mais antiga primeiro
+
+        # entrada atrasada de todos os canais: v[n] = b0 u(n - d) + b1 u(n - d - 1)
+        idx = P + np.arange(N)[:, None, None] - self.d
+        v = self.b0 * seq[idx, self._cols] + self.b1 * seq[idx - 1, self._cols]
+
+        x = np.empty((N, self.q, self.m))
+        for i in range(self.q):
+            for j in range(self.m):
+                x[:, i, j] = lfilter([1.0], [1.0, -self.a[i, j]], v[:, i, j],
+                                     zi=[self.a[i, j] * self.x[i, j]])[0]
+        if N:
+            self.x = x[-1].copy()
+            self.u_hist = seq[-P:][::-1].copy()
+        return x if canais else x.sum(axis=2)
+
+
+PLACA = FOPTD(GANHOS, CONSTANTES, ATRASOS)
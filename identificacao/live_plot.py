@@ -0,0 +1,178 @@
+"""
+    Gráficos ao vivo para as ferramentas de monitoramento da placa térmica
+
+    DataStore: buffer circular das últimas amostras (t, PV1, PV2, MV1, MV2),
+               escrito pela thread de aquisição e lido pela interface.
+    LivePlot:  atualiza linhas persistentes (Line2D) por blitting. Cada série
+               é reduzida a pares mín/máx por coluna de pixel antes de ser
+               desenhada, de modo que o custo de um quadro não cresce com a
+               duração da sessão. O fundo (eixos, grades, legendas) só é
+               redesenhado quando os limites dos eixos mudam.
+
+    O desenho é feito na thread da interface (timer da figura ou
+    FuncAnimation), nunca dentro da corrotina de aquisição.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+AMOSTRA = np.dtype([('t', 'f8'), ('pv1', 'f8'), ('pv2', 'f8'), ('mv1', 'f8'), ('mv2', 'f8')])
+MARGEM = 10  # amostras extras: a janela entregue ao plot não é sobrescrita pelas próximas MARGEM amostras
+
+
+class DataStore:
+    """Buffer circular pré-alocado com as últimas `capacidade` amostras.
+
+    Cada amostra é gravada em duas posições (i e i + capacidade), de modo que
+    a janela mais recente é sempre um trecho contíguo do buffer: add_data é
+    O(1) e get_data devolve visões, sem copiar a janela.
+    """
+
+    def __init__(self, capacidade):
+        self.lock = threading.Lock()
+        self.janela = capacidade
+        self.capacidade = capacidade + MARGEM
+        self.buffer = np.zeros(2 * self.capacidade, dtype=AMOSTRA)
+        self.seq = 0  # número de amostras recebidas (nunca é zerado)
+        self.start_time = time.time()
+        self.reset_data()
+
+    def reset_data(self):
+        with self.lock:
+            self.start_time = time.time()
+            self.inicio = self.seq  # amostras anteriores ao reset não são mais exibidas
+            print("Dados limpos.")
+
+    def add_data(self, pv1, pv2, mv1, mv2, t=None, t_rel=None):
+        # t: instante (epoch) informado pelo servidor; na falta dele, o relógio local.
+        # t_rel: instante já relativo (na unidade do chamador), gravado sem conversão
+        if t_rel is None:
+            t_rel = (time.time() if t is None else t) - self.start_time
+        with self.lock:
+            i = self.seq % self.capacidade
+            self.buffer[i] = self.buffer[i + self.capacidade] = (t_rel, pv1, pv2, mv1, mv2)
+            self.seq += 1
+
+    def snapshot(self):
+        """Retorna (seq, janela): a janela é uma visão das últimas amostras, sem cópia."""
+        with self.lock:
+            n = min(self.seq - self.inicio, self.janela)
+            fim = (self.seq - 1) % self.capacidade + self.capacidade + 1
+            return self.seq, self.buffer[fim - n:fim]
+
+    def get_data(self):
+        # Visões de cada coluna da janela (t, pv1, pv2, mv1, mv2)
+        _, janela = self.snapshot()
+        return janela['t'], janela['pv1'], janela['pv2'], janela['mv1'], janela['mv2']
+
+
+def decimar(x, y, largura):
+    """Reduz (x, y) a no máximo 2 * largura pontos, mantendo o mín. e o máx. de cada coluna.
+
+    A figura resultante é idêntica à original na resolução da tela: cada
+    coluna de pixel vira um segmento vertical entre o menor e o maior valor.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    largura = max(int(largura), 1)
+    if len(x) <= 2 * largura:
+        return x, y
+
+    inicios = np.linspace(0, len(x), largura, endpoint=False).astype(int)
+    minimos = np.minimum.reduceat(y, inicios)
+    maximos = np.maximum.reduceat(y, inicios)
+    return np.repeat(x[inicios], 2), np.column_stack([minimos, maximos]).ravel()
+
+
+class LivePlot:
+    """Atualização incremental de linhas já criadas (ax.plot) por blitting.
+
+    linhas:  {nome: Line2D}
+    janela:  largura do eixo x (mesma unidade de x); None mostra todo o histórico
+    folga:   fração da janela acrescentada à direita quando o eixo x avança,
+             para que o fundo não precise ser redesenhado a cada quadro
+    """
+
+    def __init__(self, fig, linhas, janela=None, folga=0.1):
+        self.fig = fig
+        self.canvas = fig.canvas
+        self.linhas = linhas
+        self.janela = janela
+        self.folga = folga
+        self.eixos = list(dict.fromkeys(linha.axes for linha in linhas.values()))
+        for linha in linhas.values():
+            linha.set_animated(True)  # fora do fundo; desenhadas apenas no blit
+        self._fundo = None
+        self.canvas.mpl_connect('draw_event', self._ao_desenhar)
+
+    def _ao_desenhar(self, event):
+        self._fundo = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._desenhar_linhas()
+
+    def _desenhar_linhas(self):
+        for linha in self.linhas.values():
+            linha.axes.draw_artist(linha)
+
+    def _ajustar_limites(self, series):
+        """Expande os limites se os dados saíram deles. Retorna True se algum mudou."""
+        mudou = False
+        for ax in self.eixos:
+            dados = [(x, y) for nome, (x, y) in series.items() if self.linhas[nome].axes is ax and len(x)]
+            if not dados:
+                continue
+
+            x_ini = min(x[0] for x, _ in dados)
+            x_fim = max(x[-1] for x, _ in dados)
+            x0, x1 = ax.get_xlim()
+            if x_fim > x1 or (self.janela is None and x_ini < x0):
+                span = self.janela if self.janela is not None else max(x_fim - x_ini, 1e-9)
+                x1 = x_fim + self.folga * span
+                x0 = x1 - (1 + self.folga) * span if self.janela is not None else x_ini
+                ax.set_xlim(x0, x1)
+                mudou = True
+
+            y_min = min(np.nanmin(y) for _, y in dados)
+            y_max = max(np.nanmax(y) for _, y in dados)
+            b0, b1 = ax.get_ylim()
+            if y_min < b0 or y_max > b1:
+                pad = 0.1 * max(y_max - y_min, 1e-9)
+                ax.set_ylim(min(b0, y_min - pad), max(b1, y_max + pad))
+                mudou = True
+        return mudou
+
+    def update(self, x, ys):
+        """Atualiza as séries e redesenha por blit.
+
+        ys: {nome: y} sobre o eixo x comum, ou {nome: (x, y)} para séries
+            com eixo x próprio (nesse caso x pode ser None).
+        """
+        series = {}
+        for nome, y in ys.items():
+            x_i, y_i = y if isinstance(y, tuple) else (x, y)
+            series[nome] = (np.asarray(x_i, dtype=np.float64), np.asarray(y_i, dtype=np.float64))
+
+        mudou = self._ajustar_limites(series)
+        for nome, (x_i, y_i) in series.items():
+            linha = self.linhas[nome]
+            linha.set_data(*decimar(x_i, y_i, linha.axes.bbox.width))
+
+        if mudou or self._fundo is None:
+            self.canvas.draw()  # novo fundo; _ao_desenhar desenha as linhas por cima
+            return
+        self.canvas.restore_region(self._fundo)
+        self._desenhar_linhas()
+        self.canvas.blit(self.fig.bbox)
+        self.canvas.flush_events()
+
+    def salvar(self, nome):
+        """Salva a figura incluindo as linhas animadas."""
+        for linha in self.linhas.values():
+            linha.set_animated(False)
+        try:
+            self.fig.savefig(nome)
+        finally:
+            for linha in self.linhas.values():
+                linha.set_animated(True)
+            self.canvas.draw_idle()
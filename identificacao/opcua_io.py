@@ -0,0 +1,199 @@
+"""
+    Camada de E/S OPC UA da placa térmica
+
+    Todos os nós lidos em uma amostra vão em uma única requisição Read (um
+    ReadValueId por nó) e todas as MVs em uma única requisição Write, em vez
+    de um await por nó. Com o servidor remoto isso reduz as idas e voltas por
+    ciclo de 4-5 para 1-2.
+
+    Uso:
+        async with Client(url=URL) as client:
+            io = PlacaIO(client)
+            vals = await io.ler()                 # {'PV1': ..., 'PV2': ..., 'MV1': ..., 'MV2': ...}
+            await io.escrever({'MV1': 20.0, 'MV2': 35.0})
+
+    Para aquisição contínua, criar_aquisicao() escolhe entre leitura
+    periódica (polling) e subscrição (itens monitorados) conforme
+    MODO_AQUISICAO.
+
+    As requisições de leitura e escrita são medidas por mpc.profiling
+    ('opcua.read' e 'opcua.write') quando a instrumentação está ligada.
+"""
+
+import asyncio
+import os
+import sys
+
+from asyncua import ua
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from mpc.profiling import timed
+
+URL = "opc.tcp://150.165.52.236:48030"
+URL_LOCAL = "opc.tcp://localhost:48030"
+
+# Nodes (IDs das variáveis no Servidor)
+NODE_IDS = {
+    'PV1': "ns=2;s=0:PlacaTermica.Malha1?PlacaTermica.Malha1.PV",
+    'PV2': "ns=2;s=0:PlacaTermica.Malha2?PlacaTermica.Malha2.PV",
+    'MV1': "ns=2;s=0:PlacaTermica.Malha1?PlacaTermica.Malha1.MV",
+    'MV2': "ns=2;s=0:PlacaTermica.Malha2?PlacaTermica.Malha2.MV",
+}
+
+
+class PlacaIO:
+    """Leitura e escrita em lote dos nós da placa térmica."""
+
+    def __init__(self, client, leitura=('PV1', 'PV2', 'MV1', 'MV2'), node_ids=NODE_IDS):
+        self.client = client
+        self.node_ids = {nome: ua.NodeId.from_string(nid) for nome, nid in node_ids.items()}
+        self.leitura = tuple(leitura)
+        self._leitura_ids = [self.node_ids[nome] for nome in self.leitura]
+
+    @timed('opcua.read')
+    async def ler_datavalues(self):
+        """Lê os nós de self.leitura em uma requisição; retorna os DataValue na mesma ordem."""
+        parametros = ua.ReadParameters()
+        for node_id in self._leitura_ids:
+            rv = ua.ReadValueId()
+            rv.NodeId = node_id
+            rv.AttributeId = ua.AttributeIds.Value
+            parametros.NodesToRead.append(rv)
+        parametros.TimestampsToReturn = ua.TimestampsToReturn.Both
+
+        resultados = await self.client.uaclient.read(parametros)
+        for dv in resultados:
+            dv.StatusCode.check()
+        return resultados
+
+    async def ler(self):
+        """Lê os nós de self.leitura em uma requisição; retorna {nome: valor}."""
+        resultados = await self.ler_datavalues()
+        return {nome: dv.Value.Value for nome, dv in zip(self.leitura, resultados)}
+
+    @timed('opcua.write')
+    async def escrever(self, valores):
+        """Escreve {nome: valor} (ex.: MV1 e MV2) em uma única requisição Write."""
+        node_ids = [self.node_ids[nome] for nome in valores]
+        dvs = [ua.DataValue(ua.Variant(float(v), ua.VariantType.Double)) for v in valores.values()]
+        resultados = await self.client.uaclient.write_attributes(node_ids, dvs, ua.AttributeIds.Value)
+        for status in resultados:
+            status.check()
+
+
+# --- Aquisição contínua ---
+# 'polling':      uma leitura em lote a cada período, em instantes t0 + k periodo
+# 'subscription': itens monitorados; o servidor envia apenas as mudanças
+MODO_AQUISICAO = 'subscription'
+TAMANHO_FILA = 1000   # notificações mantidas na fila (as mais antigas são descartadas)
+SILENCIO_MAX = 5      # períodos sem notificação antes de confirmar a conexão com uma leitura
+
+
+def _instante(dv):
+    """Carimbo de tempo do servidor (SourceTimestamp, ou ServerTimestamp na falta dele)."""
+    return dv.SourceTimestamp or dv.ServerTimestamp
+
+
+class AquisicaoPolling:
+    """Lê todos os nós em lote a cada período. Iteração: (timestamp, {nome: valor})."""
+
+    def __init__(self, client, periodo, leitura=('PV1', 'PV2', 'MV1', 'MV2'), node_ids=NODE_IDS):
+        self.io = PlacaIO(client, leitura=leitura, node_ids=node_ids)
+        self.periodo = periodo
+        self.ultimos = {}
+
+    async def __aenter__(self):
+        self._t0 = asyncio.get_running_loop().time()
+        self._k = 0
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        loop = asyncio.get_running_loop()
+        await asyncio.sleep(max(0.0, self._t0 + self._k * self.periodo - loop.time()))
+        self._k = max(self._k + 1, int((loop.time() - self._t0) // self.periodo) + 1)
+
+        dvs = await self.io.ler_datavalues()
+        self.ultimos = {nome: dv.Value.Value for nome, dv in zip(self.io.leitura, dvs)}
+        return max(_instante(dv) for dv in dvs), dict(self.ultimos)
+
+
+class AquisicaoSubscricao:
+    """Recebe as mudanças dos nós por uma subscrição OPC UA.
+
+    As notificações entram em uma fila asyncio limitada; cada iteração agrupa
+    as notificações já recebidas (normalmente uma resposta Publish) em uma
+    amostra com os últimos valores de todos os nós e o maior carimbo de
+    tempo do servidor entre elas.
+
+    Como o servidor só envia mudanças, SILENCIO_MAX períodos sem notificação
+    levam a uma leitura em lote: ela fornece a amostra e, se a conexão caiu,
+    gera o erro em vez de a iteração ficar parada com valores antigos.
+    """
+
+    def __init__(self, client, periodo, leitura=('PV1', 'PV2', 'MV1', 'MV2'), node_ids=NODE_IDS,
+                 tamanho_fila=TAMANHO_FILA):
+        self.client = client
+        self.io = PlacaIO(client, leitura=leitura, node_ids=node_ids)
+        self.periodo = periodo
+        self.leitura = tuple(leitura)
+        self.node_ids = node_ids
+        self.fila = asyncio.Queue(maxsize=tamanho_fila)
+        self.descartadas = 0
+        self.ultimos = {}
+        self._nomes = {}
+
+    # chamado pelo asyncua para cada item monitorado alterado
+    def datachange_notification(self, node, val, data):
+        if self.fila.full():
+            self.fila.get_nowait()
+            self.descartadas += 1
+        self.fila.put_nowait((self._nomes[node.nodeid], val, _instante(data.monitored_item.Value)))
+
+    async def __aenter__(self):
+        nodes = [self.client.get_node(self.node_ids[nome]) for nome in self.leitura]
+        self._nomes = {node.nodeid: nome for node, nome in zip(nodes, self.leitura)}
+        periodo_ms = 1000.0 * self.periodo
+        self.sub = await self.client.create_subscription(periodo_ms, self)
+        await self.sub.subscribe_data_change(nodes, sampling_interval=periodo_ms)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.sub.delete()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            notificacoes = [await asyncio.wait_for(self.fila.get(), SILENCIO_MAX * self.periodo)]
+        except asyncio.TimeoutError:
+            dvs = await self.io.ler_datavalues()
+            self.ultimos.update((nome, dv.Value.Value) for nome, dv in zip(self.leitura, dvs))
+            return max(_instante(dv) for dv in dvs), dict(self.ultimos)
+        while not self.fila.empty():
+            notificacoes.append(self.fila.get_nowait())
+        for nome, valor, _ in notificacoes:
+            self.ultimos[nome] = valor
+        return max(ts for _, _, ts in notificacoes), dict(self.ultimos)
+
+
+def criar_aquisicao(client, periodo, modo=None, **kwargs):
+    """Cria o backend de aquisição configurado em MODO_AQUISICAO (ou em modo).
+
+    Uso:
+        async with criar_aquisicao(client, periodo=2.0) as aquisicao:
+            async for t, vals in aquisicao:
+                ...
+    """
+    modo = modo or MODO_AQUISICAO
+    if modo == 'polling':
+        return AquisicaoPolling(client, periodo, **kwargs)
+    if modo == 'subscription':
+        return AquisicaoSubscricao(client, periodo, **kwargs)
+    raise ValueError(f"Modo de aquisição desconhecido: {modo}")
@@ -1,12 +1,15 @@
 import asyncio
+import bisect
 import threading
-import datetime
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.animation as animation
-from asyncua import Client, ua
+import numpy as np
+from asyncua import Client
+from opcua_io import PlacaIO, criar_aquisicao
+from live_plot import LivePlot
 
 url = "opc.tcp://localhost:48030"
 
@@ -16,39 +19,66 @@ nodes_read_ids =  ["ns=2;s=0:PlacaTermica.Malha1?PlacaTermica.Malha1.PV",
 nodes_write_ids = ["ns=2;s=0:PlacaTermica.Malha1?PlacaTermica.Malha1.MV",
                 "ns=2;s=0:PlacaTermica.Malha2?PlacaTermica.Malha2.MV"]
 
+JANELA = 50  # amostras de leitura exibidas no gráfico
+ESPERA_MIN, ESPERA_MAX = 1.0, 30.0  # espera entre tentativas após falha de leitura [s]
+
 # Variáveis globais
+T0 = time.monotonic()
 times_read = []
 values_read = {i: [] for i in range(len(nodes_read_ids))}
 times_write = []
 values_write = {i: [] for i in range(len(nodes_write_ids))}
+escritos = [0.0] * len(nodes_write_ids)  # último valor enviado a cada nó
 labels_read = []
 labels_write = []
 
 client = None
-nodes_read = []
-nodes_write = []
+io = None
+ultimos = {}  # últimos valores recebidos pela aquisição
 loop = asyncio.new_event_loop()
 
 # -------- OPC UA (async) --------
 async def connect_opcua():
-    global client, nodes_read, nodes_write
+    global client, io
     client = Client(url=url)
     await client.connect()
     print("Conectado ao servidor OPC UA (async)")
-    nodes_read = [client.get_node(nid) for nid in nodes_read_ids]
-    nodes_write = [client.get_node(nid) for nid in nodes_write_ids]
+    node_ids = {nid: nid for nid in nodes_read_ids + nodes_write_ids}
+    io = PlacaIO(client, leitura=nodes_read_ids, node_ids=node_ids)
+    asyncio.ensure_future(acquire_loop(node_ids))
+
+async def acquire_loop(node_ids):
+    # Polling em lote ou subscrição, conforme opcua_io.MODO_AQUISICAO. Uma falha
+    # descarta os últimos valores (o gráfico não mostra leituras antigas como
+    # atuais), reconecta e recomeça a aquisição com espera crescente.
+    global ultimos
+    espera = ESPERA_MIN
+    while True:
+        try:
+            async with criar_aquisicao(client, periodo=1.0, leitura=nodes_read_ids, node_ids=node_ids) as aquisicao:
+                async for _, vals in aquisicao:
+                    ultimos = vals
+                    espera = ESPERA_MIN
+        except Exception as e:
+            print(f"Erro leitura: {e} (nova tentativa em {espera:.0f} s)")
+        ultimos = {}
+        await asyncio.sleep(espera)
+        espera = min(2 * espera, ESPERA_MAX)
+        try:
+            await client.disconnect()
+        except Exception:
+            pass
+        try:
+            await client.connect()
+        except Exception as e:
+            print("Erro reconexão:", e)
 
 async def read_values():
-    try:
-        vals = await asyncio.gather(*[n.read_value() for n in nodes_read])
-        return vals
-    except Exception as e:
-        print("Erro leitura:", e)
-        return [None] * len(nodes_read)
+    return [ultimos.get(nid) for nid in nodes_read_ids]
 
 async def write_value(index, valor):
     try:
-        await nodes_write[index].write_value(ua.Variant(valor, ua.VariantType.Double))
+        await io.escrever({nodes_write_ids[index]: valor})
         print(f"Valor {valor} escrito no nó {nodes_write_ids[index]}")
     except Exception as e:
         print(f"Erro escrita no nó {nodes_write_ids[index]}:", e)
@@ -72,23 +102,35 @@ plt.subplots_adjust(hspace=0.5)
 canvas = FigureCanvasTkAgg(fig, master=frame_grafico)
 canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+# Linhas persistentes; cada quadro só troca os dados e redesenha por blit
+ax_read.set_xlabel("Tempo (s)")
+ax_read.set_ylabel("Valor")
+ax_read.set_title("Valores Lidos do Servidor")
+ax_write.set_xlabel("Tempo (s)")
+ax_write.set_ylabel("Valor")
+ax_write.set_title("Valores Escritos no Servidor")
+linhas = {}
+for i, nid in enumerate(nodes_read_ids):
+    linhas[f"read{i}"], = ax_read.plot([], [], marker="o", label=f"Node {nid}")
+for i, nid in enumerate(nodes_write_ids):
+    linhas[f"write{i}"], = ax_write.plot([], [], marker="x", drawstyle="steps-post", label=f"Node {nid}")
+ax_read.legend()
+ax_write.legend()
+grafico = LivePlot(fig, linhas, janela=JANELA)  # uma leitura por segundo
+
 # Atualização do gráfico
-def update(frame):
+def update():
     # Ler valores
     future = asyncio.run_coroutine_threadsafe(read_values(), loop)
     vals = future.result(timeout=2)
 
-    
-
     if any(v is not None for v in vals):
-        now = datetime.datetime.now().strftime("%H:%M:%S")
-        times_read.append(now)
+        times_read.append(time.monotonic() - T0)
 
         for i, val in enumerate(vals):
-            if val is not None:
-                values_read[i].append(val)
+            values_read[i].append(np.nan if val is None else val)
 
-            # Atualizar Labels com os últimos valores lidos
+        # Atualizar Labels com os últimos valores lidos
         for i, lbl in enumerate(labels_read):
             if len(values_read[i]) > 0:
                 lbl.config(text=f"Lido: {values_read[i][-1]:.2f}")
@@ -98,31 +140,22 @@ def update(frame):
             if len(values_write[i]) > 0:
                 lbl.config(text=f"Escrito: {values_write[i][-1]:.2f}")
 
-        # Gráfico superior - leituras
-        ax_read.cla()
-        times_plot = times_read[-50:]
+        # Últimas JANELA leituras; as escritas em degrau até o instante atual
+        series = {}
+        t_read = times_read[-JANELA:]
         for i in range(len(nodes_read_ids)):
-            values_plot = values_read[i][-50:]
-            ax_read.plot(times_plot, values_plot, marker="o", label=f"Node {nodes_read_ids[i]}")
-        ax_read.set_xlabel("Tempo")
-        ax_read.set_ylabel("Valor")
-        ax_read.set_title("Valores Lidos do Servidor")
-        ax_read.tick_params(axis="x", rotation=45)
-        ax_read.legend()
-
-        # Gráfico inferior - valores escritos
-        ax_write.cla()
-        times_plot_w = times_write[-50:]
+            series[f"read{i}"] = (t_read, values_read[i][-JANELA:])
+        k = bisect.bisect_right(times_write, t_read[0])
+        t_write = [t_read[0]] + times_write[k:]
+        t_write.append(max(t_read[-1], t_write[-1]))
         for i in range(len(nodes_write_ids)):
-            values_plot_w = values_write[i][-50:]
-            ax_write.plot(times_plot_w, values_plot_w, marker="x", label=f"Node {nodes_write_ids[i]}")
-        ax_write.set_xlabel("Tempo")
-        ax_write.set_ylabel("Valor")
-        ax_write.set_title("Valores Escritos no Servidor")
-        ax_write.tick_params(axis="x", rotation=45)
-        ax_write.legend()
+            anterior = values_write[i][k - 1] if k > 0 else 0.0
+            series[f"write{i}"] = (t_write, [anterior] + values_write[i][k:] + [escritos[i]])
+        grafico.update(None, series)
 
-ani = animation.FuncAnimation(fig, update, interval=1000)
+timer = canvas.new_timer(interval=1000)
+timer.add_callback(update)
+timer.start()
 
 # Frame inferior (entradas de dados para escrita)
 frame_controle = ttk.Frame(root, padding=10)
@@ -133,10 +166,11 @@ entries = []
 def enviar_valor(idx):
     try:
         novo_valor = float(entries[idx].get())
-        # Atualiza lista local para plot
-        now = datetime.datetime.now().strftime("%H:%M:%S")
-        times_write.append(now)
-        values_write[idx].append(novo_valor)
+        # Atualiza lista local para plot (valores de todos os nós no instante da escrita)
+        escritos[idx] = novo_valor
+        times_write.append(time.monotonic() - T0)
+        for i, valor in enumerate(escritos):
+            values_write[i].append(valor)
         # Envia para o servidor
         asyncio.run_coroutine_threadsafe(write_value(idx, novo_valor), loop)
         messagebox.showinfo("Sucesso", f"Valor {novo_valor} enviado ao nó {nodes_write_ids[idx]}")
@@ -0,0 +1,229 @@
+"""
+    Controle DMPC em malha fechada da placa térmica
+
+    A cada período Ts o script lê PV1/PV2, calcula Δu pelo DMPC (ganhos em
+    cache, ou Hildreth quando há restrições; com explicito=True a lei afim por
+    partes calculada offline substitui o QP online) e escreve MV1/MV2. Com ruído de
+    medição, o estado do modelo aumentado é estimado por um filtro de Kalman
+    em regime permanente (mpc.StateEstimator) em vez de usar as PVs lidas. Os instantes
+    de amostragem são fixados em t0 + k Ts (relógio monotônico), sem acúmulo
+    de deriva, e a latência de cada etapa (leitura, cálculo, escrita) é
+    registrada junto com o número de prazos perdidos. Com PERFIL = True,
+    mpc.profiling mede também a montagem do controlador, o QP e as
+    requisições OPC UA, e o resumo e o trace são salvos em PERFIL_ARQUIVO.
+
+    Para testar sem a planta real execute servidor_simulado.py e use
+    URL = "opc.tcp://localhost:48030".
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+from asyncua import Client
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from mpc import (augmented_system, get_controller, constraint_matrices, DMPCSolver,
+                 DelaySystem, StateEstimator, ExplicitMPC, profiling)
+from opcua_io import PlacaIO
+from foptd import PLACA
+
+# --- Configurações Iniciais ---
+# url = "opc.tcp://150.165.52.236:48030"
+URL = "opc.tcp://localhost:48030"
+TS = 2.0                     # Tempo de amostragem [s]
+N_AMOSTRAS = 900             # 30 minutos
+REFERENCIA = [35.0, 32.0]    # Setpoints de PV1 e PV2 [°C]
+T_AMBIENTE = 25.0            # PV com MV = 0 (ponto de operação do modelo)
+
+# Sintonia do DMPC
+N_P, N_C, R_W = 60, 5, 1.0
+DU_RANGE = (-10.0, 10.0)     # limites de Δu [%]
+U_RANGE = (0.0, 100.0)       # limites de MV [%]
+
+# Filtro de Kalman (modelo aumentado [Δx_m; y])
+RUIDO_PV = 0.1               # desvio padrão do ruído de medição das PVs [°C]
+Q_X = 1e-8                   # variância do ruído de processo em Δx_m (modelo confiável)
+Q_Y = 1e-3                   # variância da perturbação (passeio aleatório) nas saídas
+
+# Instrumentação (mpc.profiling)
+PERFIL = False
+PERFIL_ARQUIVO = "perfil_controle"   # .json (resumo e histogramas) e .csv (trace)
+
+
+class ControladorPlaca:
+    """DMPC no modelo aumentado.
+
+    Sem ruido, Δx_m vem do modelo da planta e y das PVs medidas. Com ruido
+    (desvio padrão das PVs), o estado aumentado completo é estimado por um
+    filtro de Kalman com Q = diag(q_x I, q_y I) e R = ruido² I.
+
+    Com restrições e explicito=True, Δu vem do MPC explícito (mesma solução
+    do QP); o Hildreth fica apenas como reserva para parâmetros fora das regiões.
+    """
+
+    def __init__(self, A_m, B_m, C_m, N_p=N_P, N_c=N_C, r_w=R_W, restricoes=None, y_op=T_AMBIENTE, FPhi=None,
+                 ruido=None, q_x=Q_X, q_y=Q_Y, explicito=False):
+        self.A_m, self.B_m = A_m, B_m
+        self.y_op = y_op
+        A, B, C = augmented_system(A_m, B_m, C_m)
+        self.dmpc = get_controller(A, B, C, N_p, N_c, r_w, FPhi=FPhi)
+        self.m = B_m.shape[1]
+
+        self.solver = None
+        if restricoes is not None:
+            du_range, u_range = restricoes
+            self.M, self.gamma0, self.S = constraint_matrices(N_c, du_range, u_range, m=self.m)
+            self.solver = DMPCSolver(self.dmpc, self.M)
+        self.explicito = ExplicitMPC(self.dmpc, self.M, self.gamma0, self.S) if restricoes is not None and explicito else None
+
+        self.estimador = None
+        if ruido is not None:
+            n, q = A_m.shape[0], C_m.shape[0]
+            Q = np.diag(np.concatenate([np.full(n, q_x), np.full(q, q_y)]))
+            self.estimador = StateEstimator.kalman(A, B, C, Q, ruido ** 2 * np.eye(q))
+            self._y = np.empty(q)
+            self._inicio = True
+
+        self.x_m = np.zeros(A_m.shape[0])
+        self.u = np.zeros(self.m)
+        self.du = np.zeros(self.m)
+
+    def _estado(self, pv):
+        """Estado aumentado [Δx_m; y - y_op] da amostra atual."""
+        if self.estimador is None:
+            x_m_ant = self.x_m
+            self.x_m = self.A_m @ self.x_m + self.B_m @ self.u
+            return np.concatenate([self.x_m - x_m_ant, np.asarray(pv) - self.y_op])
+
+        np.subtract(pv, self.y_op, out=self._y)
+        if self._inicio:
+            # planta em repouso na primeira leitura: Δx_m = 0 e y medido
+            self._inicio = False
+            self.estimador.reset(np.concatenate([np.zeros(self.estimador.n - len(self._y)), self._y]))
+            return self.estimador.x
+        return self.estimador.update(self._y, self.du)
+
+    def passo(self, pv, r):
+        """Retorna o novo MV (absoluto) a partir das PVs medidas e da referência."""
+        x = self._estado(pv)
+        r = np.asarray(r) - self.y_op
+
+        du = None
+        if self.solver is None:
+            du = self.dmpc.delta_u(x, r)
+        elif self.explicito is not None:
+            du = self.explicito.delta_u(x, r, self.u)
+        if du is None:
+            if self.explicito is not None:
+                profiling.count('explicit.miss')   # fora das regiões: QP online
+            du = self.solver.solve(x, r, self.gamma0 + self.S @ self.u).x[:self.m]
+
+        self.du = du
+        self.u = self.u + du
+        return self.u
+
+
+def controlador_com_atrasos(Ts=TS, modelo=PLACA, N_p=N_P, N_c=N_C, **kwargs):
+    """ControladorPlaca sobre o modelo com tempo morto (cadeias de atraso por entrada)."""
+    sistema = DelaySystem(*modelo, T=Ts)
+    return ControladorPlaca(*sistema.matrices(), N_p=N_p, N_c=N_c, FPhi=sistema.FPhi(N_p, N_c), **kwargs)
+
+
+class Latencias:
+    """Latência por ciclo (leitura, cálculo, escrita) e prazos perdidos."""
+
+    ETAPAS = ('leitura', 'calculo', 'escrita', 'atraso')
+
+    def __init__(self, n, Ts):
+        self.Ts = Ts
+        self.dados = {etapa: np.full(n, np.nan) for etapa in self.ETAPAS}
+        self.perdas = 0
+        self.k = 0
+
+    def registrar(self, leitura, calculo, escrita, atraso):
+        for etapa, valor in zip(self.ETAPAS, (leitura, calculo, escrita, atraso)):
+            self.dados[etapa][self.k] = valor
+        self.k += 1
+
+    def resumo(self):
+        linhas = []
+        for etapa in self.ETAPAS:
+            v = 1e3 * self.dados[etapa][:self.k]
+            if v.size:
+                linhas.append(f"{etapa:>8}: média {np.mean(v):8.2f} ms | p99 {np.percentile(v, 99):8.2f} ms"
+                              f" | máx {np.max(v):8.2f} ms")
+        linhas.append(f"Prazos perdidos: {self.perdas} de {self.k} ciclos (Ts = {self.Ts} s)")
+        return "\n".join(linhas)
+
+
+async def laco_controle(controlador, referencia=REFERENCIA, n_amostras=N_AMOSTRAS, Ts=TS, url=URL):
+    """Executa o laço de controle e retorna (log, latencias).
+
+    log tem formato (n_amostras, 5): t, PV1, PV2, MV1, MV2.
+    """
+    client = Client(url=url)
+    log = np.full((n_amostras, 5), np.nan)
+    latencias = Latencias(n_amostras, Ts)
+
+    io = PlacaIO(client, leitura=('PV1', 'PV2'))
+
+    await client.connect()
+    try:
+        loop = asyncio.get_running_loop()
+        t0 = loop.time()
+        k = 0   # índice do instante de amostragem t0 + k Ts
+        for amostra in range(n_amostras):
+            # aguarda o próximo instante da grade fixa
+            await asyncio.sleep(max(0.0, t0 + k * Ts - loop.time()))
+            atraso = loop.time() - (t0 + k * Ts)
+
+            t_ini = time.perf_counter()
+            pv = list((await io.ler()).values())
+            t_leitura = time.perf_counter()
+
+            with profiling.timer('controller.step'):
+                mv = controlador.passo(pv, referencia)
+            t_calculo = time.perf_counter()
+
+            await io.escrever({'MV1': mv[0], 'MV2': mv[1]})
+            t_escrita = time.perf_counter()
+
+            latencias.registrar(t_leitura - t_ini, t_calculo - t_leitura, t_escrita - t_calculo, atraso)
+            log[amostra] = [k * Ts, pv[0], pv[1], mv[0], mv[1]]
+
+            # se o ciclo passou do próximo instante, os instantes perdidos são pulados
+            k += 1
+            atrasados = int((loop.time() - t0) // Ts) - k + 1
+            if atrasados > 0:
+                latencias.perdas += atrasados
+                k += atrasados
+    finally:
+        try:
+            # deixa a planta em segurança
+            await io.escrever({'MV1': 0.0, 'MV2': 0.0})
+        finally:
+            await client.disconnect()
+
+    return log, latencias
+
+
+async def main():
+    if PERFIL:
+        profiling.enable(trace=True)
+    controlador = controlador_com_atrasos(TS, restricoes=(DU_RANGE, U_RANGE), ruido=RUIDO_PV,
+                                          explicito=True)
+    print(f"Conectando OPC UA ({URL})...")
+    log, latencias = await laco_controle(controlador)
+    np.savetxt("dados_controle.csv", log, delimiter=',', header="t,PV1,PV2,MV1,MV2", comments='')
+    print(latencias.resumo())
+    if PERFIL:
+        print(profiling.summary(budget=TS))
+        profiling.export_json(PERFIL_ARQUIVO + ".json")
+        profiling.export_trace(PERFIL_ARQUIVO + ".csv")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
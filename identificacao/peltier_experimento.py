@@ -5,20 +5,26 @@
     arquivos de texto.
 
     Para visualizar a execução, execute peltier_viewer.py
+    Com PERFIL = True, a latência de escrita, leitura e do ciclo completo é
+    medida por mpc.profiling e resumida no fim (trace em PERFIL_ARQUIVO).
 """
 
 import asyncio
+import os
 import time
-import csv
 import numpy as np
 import sys
-from asyncua import Client, ua
+from asyncua import Client
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from mpc import profiling
+from opcua_io import PlacaIO, NODE_IDS as node_ids
+from registro import RegistroBinario, exportar_csv
 
 # --- Configurações Iniciais ---
 # url = "opc.tcp://localhost:48030"
 url = "opc.tcp://150.165.52.236:48030"
 filename_input = "prbs_malha2.txt"
-filename_output = "dados_processo2.csv"
+filename_output = "dados_processo2.bin"   # registro binário; exportado também em CSV no fim
 
 # Parâmetros do Sinal
 signal_offset = 0.5
@@ -26,13 +32,9 @@ signal_gain   = 0.2 * 100
 ponto_operacao = 20
 input_ts = 2.0  # Tempo de amostragem
 
-# Nodes (IDs das variáveis no Servidor)
-node_ids = {
-    'PV1': "ns=2;s=0:PlacaTermica.Malha1?PlacaTermica.Malha1.PV",
-    'PV2': "ns=2;s=0:PlacaTermica.Malha2?PlacaTermica.Malha2.PV",
-    'MV1': "ns=2;s=0:PlacaTermica.Malha1?PlacaTermica.Malha1.MV",
-    'MV2': "ns=2;s=0:PlacaTermica.Malha2?PlacaTermica.Malha2.MV",
-}
+# Instrumentação (mpc.profiling)
+PERFIL = False
+PERFIL_ARQUIVO = "perfil_experimento.csv"
 
 # --- 1. Preparação do Sinal ---
 print("--- PREPARAÇÃO ---")
@@ -73,20 +75,20 @@ if resp != 'Y':
 # --- 2. Loop de Controle (Async) ---
 async def main_control_loop():
     client = Client(url=url)
+    if PERFIL:
+        profiling.enable(trace=True)
     
     try:
-        # Abre CSV para salvar dados imediatamente
-        with open(filename_output, mode='w', newline='') as csv_file:
-            fieldnames = ['Tempo_Relativo', 'PV1', 'PV2', 'CMD', 'MV1', 'MV2']
-            writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
-            writer.writeheader()
+        # Abre o registro binário para salvar dados imediatamente
+        with RegistroBinario(filename_output, ('t', 'pv1', 'pv2', 'cmd', 'mv1', 'mv2'),
+                             node_ids=node_ids, Ts=input_ts, ponto_operacao=ponto_operacao) as registro:
             
             print(f"Conectando OPC UA ({url})...")
             await client.connect()
             print("Conectado! Iniciando experimento...")
             
-            # Pega os nodes
-            nodes = {k: client.get_node(v) for k, v in node_ids.items()}
+            # Leitura e escrita em lote (uma requisição cada)
+            io = PlacaIO(client)
             
             start_time = time.time()
             
@@ -94,39 +96,27 @@ async def main_control_loop():
             for idx, val_mv1 in enumerate(input_signal):
                 iter_start = time.time()
                 current_time = iter_start - start_time
+                with profiling.timer('cycle'):
+                    # 1. ESCRITA (Aplica o sinal na planta)
+                    try:
+                        await io.escrever({'MV2': val_mv1})
+                        # await io.escrever({'MV1': 0.0, 'MV2': val_mv1}) # Garante MV1 em 0 se necessário
+                    except Exception as e:
+                        print(f"Erro Write: {e}")
+
+                    # 2. LEITURA (Lê sensores)
+                    try:
+                        vals = await io.ler()
+                    except Exception as e:
+                        print(f"Erro Read: {e}")
+                        vals = {k: 0.0 for k in node_ids}
+
+                    # 3. SALVAR NO ARQUIVO
+                    # Cada registro vai para o disco na hora (fsync em lote), se crachar os dados até aqui estão salvos
+                    registro.escrever(current_time, vals['PV1'], vals['PV2'], val_mv1, vals['MV1'], vals['MV2'])
                 
-                # 1. ESCRITA (Aplica o sinal na planta)
-                try:
-                    dv = ua.DataValue(ua.Variant(float(val_mv1), ua.VariantType.Double))
-                    await nodes['MV2'].write_value(dv)
-                    # await nodes['MV2'].write_value(0) # Garante MV2 em 0 se necessário
-                except Exception as e:
-                    print(f"Erro Write: {e}")
-
-                # 2. LEITURA (Lê sensores)
-                vals = {}
-                try:
-                    for name, node in nodes.items():
-                        vals[name] = await node.read_value()
-                except Exception as e:
-                    print(f"Erro Read: {e}")
-                    vals = {k: 0.0 for k in node_ids}
-
-                # 3. SALVAR NO ARQUIVO
-                # Salvamos linha a linha para garantir que se crachar, os dados até aqui estão salvos
-                row_data = {
-                    'Tempo_Relativo': f"{current_time:.2f}",
-                    'PV1': vals['PV1'], 
-                    'PV2': vals['PV2'],
-                    'CMD': val_mv1,          # comando aplicado
-                    'MV1': vals['MV1'],      # comando lido na MV1, se aplicado
-                    'MV2': vals['MV2']       # comando lido na MV2, se aplicado
-                }
-                writer.writerow(row_data)
-                csv_file.flush() # Força a gravação no disco
-                
-                print(f"[{idx+1}/{len(input_signal)}] T={current_time:.1f}s | MV1_CMD: {val_mv1:.1f} | PV1: {vals['PV1']:.1f} | MV2 {vals['MV2']:.1f}")
-                
+                    print(f"[{idx+1}/{len(input_signal)}] T={current_time:.1f}s | MV1_CMD: {val_mv1:.1f} | PV1: {vals['PV1']:.1f} | MV2 {vals['MV2']:.1f}")
+
                 # 4. CONTROLE DE TEMPO (Ts)
                 elapsed = time.time() - iter_start
                 sleep_time = max(0, input_ts - elapsed)
@@ -142,7 +132,12 @@ async def main_control_loop():
                 print("Cliente OPC UA desconectado.")
             except:
                 pass
-        print(f"\nExperimento finalizado. Dados salvos em '{filename_output}'.")
+        filename_csv = filename_output.replace('.bin', '.csv')
+        exportar_csv(filename_output, filename_csv)
+        print(f"\nExperimento finalizado. Dados salvos em '{filename_output}' e '{filename_csv}'.")
+        if PERFIL:
+            print(profiling.summary(budget=input_ts))
+            profiling.export_trace(PERFIL_ARQUIVO)
 
 if __name__ == "__main__":
     # Executa o loop assíncrono diretamente na thread principal
@@ -2,68 +2,21 @@ import asyncio
 import threading
 import time
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 from matplotlib.widgets import Button
 from asyncua import Client
+from opcua_io import criar_aquisicao, NODE_IDS
+from live_plot import DataStore, LivePlot
+from registro import RegistroBinario
 import sys
-import csv
 
 # --- Configurações ---
 URL = "opc.tcp://150.165.52.236:48030"
 REFRESH_RATE_MS = 2000  # Atualização do gráfico (ms)
 SAMPLE_RATE_MS = 2000
-WINDOW_SIZE = 2000      # Janela de tempo móvel (segundos) para manter no gráfico
-
-# Nodes (Mesmos IDs do seu código)
-NODE_IDS = {
-    'PV1': "ns=2;s=0:PlacaTermica.Malha1?PlacaTermica.Malha1.PV",
-    'PV2': "ns=2;s=0:PlacaTermica.Malha2?PlacaTermica.Malha2.PV",
-    'MV1': "ns=2;s=0:PlacaTermica.Malha1?PlacaTermica.Malha1.MV",
-    'MV2': "ns=2;s=0:PlacaTermica.Malha2?PlacaTermica.Malha2.MV"
-}
+WINDOW_SIZE = 2000      # Janela móvel (amostras) mantida no gráfico
 
 # --- Dados Compartilhados (Thread Safe Logic) ---
-class DataStore:
-    def __init__(self):
-        self.lock = threading.Lock()
-        self.start_time = time.time()
-        self.reset_data()
-
-    def reset_data(self):
-        with self.lock:
-            self.start_time = time.time()
-            self.time = []
-            self.pv1 = []
-            self.pv2 = []
-            self.mv1 = []
-            self.mv2 = []
-            print("Dados limpos.")
-
-    def add_data(self, pv1, pv2, mv1, mv2):
-        t = time.time() - self.start_time
-        with self.lock:
-            self.time.append(t)
-            self.pv1.append(pv1)
-            self.pv2.append(pv2)
-            self.mv1.append(mv1)
-            self.mv2.append(mv2)
-
-            # desliza a janela
-            index = len(self.time)
-            if index > (WINDOW_SIZE + 10):
-                self.time = self.time[10:]
-                self.pv1 = self.pv1[10:]
-                self.pv2 = self.pv2[10:]
-                self.mv1 = self.mv1[10:]
-                self.mv2 = self.mv2[10:]
-
-    def get_data(self):
-        # Retorna uma cópia dos dados para evitar conflito de thread no plot
-        with self.lock:
-            return (list(self.time), list(self.pv1), list(self.pv2), 
-                    list(self.mv1), list(self.mv2))
-
-store = DataStore()
+store = DataStore(WINDOW_SIZE)
 monitoring = True
 
 # --- Thread de Comunicação OPC UA ---
@@ -71,42 +24,29 @@ async def opc_worker():
     print(f"Monitor: Tentando conectar em {URL}...")
     client = Client(url=URL)
     try:
-        csv_file = open('process_viewer.csv', mode='w', newline='')
-        fieldnames = ["Timestamp", "PV1", "PV2", "MV1", "MV2"]
-        writer = csv.DictWriter(f=csv_file, fieldnames=fieldnames)
-        
-        if csv_file.tell() == 0:
-            writer.writeheader()
+        # t em segundos desde a época (carimbo do servidor); exporte com registro.exportar_csv
+        registro = RegistroBinario('process_viewer.bin', node_ids=NODE_IDS, Ts=SAMPLE_RATE_MS / 1000.0)
 
         await client.connect()
         print("Monitor: Conectado ao OPC UA!")
         
-        nodes = {k: client.get_node(v) for k, v in NODE_IDS.items()}
-        
         while monitoring:
             try:
-                # Leitura em lote é mais eficiente
-                vals = []
-                for key in ['PV1', 'PV2', 'MV1', 'MV2']:
-                    val = await nodes[key].read_value()
-                    vals.append(val)
-                
-                store.add_data(vals[0], vals[1], vals[2], vals[3])
-                row_data = {
-                    'Timestamp': f"{0:.2f}",
-                    'PV1': vals[0], 
-                    'PV2': vals[1],
-                    'MV1': vals[2],      # comando lido na MV1, se aplicado
-                    'MV2': vals[3]       # comando lido na MV2, se aplicado
-                }
-                writer.writerow(row_data)
-                csv_file.flush() # Força a gravação no disco
+                # Polling em lote ou subscrição, conforme opcua_io.MODO_AQUISICAO
+                async with criar_aquisicao(client, periodo=SAMPLE_RATE_MS / 1000.0) as aquisicao:
+                    async for t_servidor, vals in aquisicao:
+                        if not monitoring:
+                            break
+                        if len(vals) < len(NODE_IDS):
+                            continue  # aguarda o primeiro valor de cada nó
+
+                        t = t_servidor.timestamp()
+                        store.add_data(vals['PV1'], vals['PV2'], vals['MV1'], vals['MV2'], t=t)
+                        registro.escrever(t, vals['PV1'], vals['PV2'], vals['MV1'], vals['MV2'])
             except Exception as e:
                 print(f"Erro na leitura: {e}")
                 await asyncio.sleep(1) # Espera um pouco antes de tentar de novo
-            
-            await asyncio.sleep(SAMPLE_RATE_MS / 1000.0) # Taxa de amostragem do monitor
-            
+
     except Exception as e:
         print(f"Erro de conexão no Monitor: {e}")
     finally:
@@ -114,7 +54,7 @@ async def opc_worker():
             await client.disconnect()
         except:
             pass
-        csv_file.close()
+        registro.fechar()
         print("Monitor desconectado.")
 
 def start_background_loop(loop):
@@ -146,35 +86,19 @@ def start_gui():
     ax1.legend(loc='upper right')
     ax2.legend(loc='upper right')
 
-    def update(frame):
-        # 1. Pega cópia segura dos dados
-        t, pv1, pv2, mv1, mv2 = store.get_data()
-        
-        if not t: return l_pv1, l_pv2, l_mv1, l_mv2
-
-        # 2. Segurança contra vetores de tamanhos diferentes (Causa raiz do seu crash anterior)
-        min_len = min(len(t), len(pv1), len(pv2), len(mv1), len(mv2))
-        t = t[:min_len]
-        pv1 = pv1[:min_len]
-        pv2 = pv2[:min_len]
-        mv1 = mv1[:min_len]
-        mv2 = mv2[:min_len]
-
-        # 3. Atualiza Linhas
-        l_pv1.set_data(t, pv1)
-        l_pv2.set_data(t, pv2)
-        l_mv1.set_data(t, mv1)
-        l_mv2.set_data(t, mv2)
-
-        # 4. Ajuste de Escala X (Janela deslizante)
-        if len(t) > WINDOW_SIZE:
-            ax1.set_xlim(t[-1] - WINDOW_SIZE, t[-1] + 2)
-            ax2.set_xlim(t[-1] - WINDOW_SIZE, t[-1] + 2)
-        else:
-            ax1.set_xlim(0, max(10, t[-1] + 2))
-            ax2.set_xlim(0, max(10, t[-1] + 2))
-
-        return l_pv1, l_pv2, l_mv1, l_mv2
+    # Linhas persistentes atualizadas por blitting; a janela de 2000 amostras
+    # é decimada para a largura do eixo em pixels antes de cada quadro
+    grafico = LivePlot(fig, {'pv1': l_pv1, 'pv2': l_pv2, 'mv1': l_mv1, 'mv2': l_mv2},
+                       janela=WINDOW_SIZE * SAMPLE_RATE_MS / 1000.0)
+    ultimo_seq = [-1]
+
+    def update():
+        # Visão da janela atual (sem cópia); nada a fazer se não chegou amostra nova
+        seq, janela = store.snapshot()
+        if len(janela) == 0 or seq == ultimo_seq[0]:
+            return
+        ultimo_seq[0] = seq
+        grafico.update(janela['t'], {nome: janela[nome] for nome in grafico.linhas})
 
     # --- Botões ---
     # Botão Limpar
@@ -191,11 +115,14 @@ def start_gui():
 
     def on_save(event):
         nome = f"monitor_print_{int(time.time())}.png"
-        plt.savefig(nome)
+        grafico.salvar(nome)
         print(f"Imagem salva como {nome}")
     btn_save.on_clicked(on_save)
 
-    ani = animation.FuncAnimation(fig, update, interval=REFRESH_RATE_MS, blit=False, cache_frame_data=False)
+    # O desenho roda no timer da interface; a aquisição fica na thread OPC
+    timer = fig.canvas.new_timer(interval=REFRESH_RATE_MS)
+    timer.add_callback(update)
+    timer.start()
     plt.show()
 
 if __name__ == "__main__":
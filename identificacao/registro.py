@@ -0,0 +1,169 @@
+"""
+    Registro binário dos experimentos na placa térmica
+
+    Formato (little-endian):
+        MAGICO (8 bytes) | tamanho do cabeçalho (uint32) | cabeçalho JSON | registros
+
+    O cabeçalho guarda as colunas, os IDs dos nós, o período de amostragem e
+    o ponto de operação, e é completado com espaços até um múltiplo de
+    ALINHAMENTO bytes. Cada registro é uma linha de float64 com uma posição
+    por coluna, de modo que o arquivo inteiro pode ser aberto com np.memmap
+    sem cópia nem conversão de texto.
+
+    O arquivo só cresce: cada registro é entregue ao sistema operacional
+    assim que escrito (sobrevive a uma queda do processo) e os fsync são
+    agrupados a cada FSYNC_REGISTROS registros ou FSYNC_INTERVALO segundos
+    (limita a perda em uma queda de energia). Um registro incompleto no fim
+    do arquivo é ignorado na leitura e descartado ao reabrir para escrita.
+
+    Uso:
+        with RegistroBinario("dados.bin", ('t', 'pv1', 'pv2', 'mv1', 'mv2'), Ts=2.0) as reg:
+            reg.escrever(t, pv1, pv2, mv1, mv2)
+
+        cabecalho, dados = abrir_registro("dados.bin")   # dados['pv1'] é uma visão do arquivo
+        exportar_csv("dados.bin", "dados.csv")
+"""
+
+import json
+import os
+import struct
+import time
+
+import numpy as np
+
+MAGICO = b"PLTLOG01"
+ALINHAMENTO = 64
+FSYNC_REGISTROS = 30      # 1 min de dados a Ts = 2 s
+FSYNC_INTERVALO = 60.0    # [s]
+
+COLUNAS = ('t', 'pv1', 'pv2', 'mv1', 'mv2')
+
+
+def _dtype(colunas):
+    return np.dtype([(nome, '<f8') for nome in colunas])
+
+
+def ler_cabecalho(path):
+    """Retorna (cabeçalho, deslocamento dos registros) ou None se o arquivo não é um registro binário."""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGICO)) != MAGICO:
+            return None
+        tamanho, = struct.unpack('<I', f.read(4))
+        cabecalho = json.loads(f.read(tamanho).decode('utf-8'))
+    return cabecalho, len(MAGICO) + 4 + tamanho
+
+
+def _montar_cabecalho(cabecalho):
+    corpo = json.dumps(cabecalho, ensure_ascii=False).encode('utf-8')
+    tamanho = len(MAGICO) + 4 + len(corpo)
+    corpo += b' ' * (-tamanho % ALINHAMENTO)
+    return MAGICO + struct.pack('<I', len(corpo)) + corpo
+
+
+class RegistroBinario:
+    """Escrita sequencial de registros float64 com fsync em lote.
+
+    colunas:        nomes das colunas (o primeiro deve ser o tempo 't')
+    node_ids:       {nome: NodeId} dos nós registrados
+    Ts:             período de amostragem [s]
+    ponto_operacao: ponto de operação do experimento (número ou dict)
+    anexar:         continua um registro existente com as mesmas colunas
+    """
+
+    def __init__(self, path, colunas=COLUNAS, node_ids=None, Ts=None, ponto_operacao=None,
+                 anexar=False, fsync_registros=FSYNC_REGISTROS, fsync_intervalo=FSYNC_INTERVALO):
+        self.path = path
+        self.colunas = tuple(colunas)
+        self.dtype = _dtype(self.colunas)
+        self.fsync_registros = fsync_registros
+        self.fsync_intervalo = fsync_intervalo
+        self._registro = np.zeros(1, dtype=self.dtype)
+
+        existente = ler_cabecalho(path) if anexar and os.path.exists(path) else None
+        if existente is not None:
+            self.cabecalho, inicio = existente
+            if tuple(self.cabecalho['colunas']) != self.colunas:
+                raise ValueError(f"Colunas de {path} diferem: {self.cabecalho['colunas']}")
+            self._fd = os.open(path, os.O_WRONLY)
+            # descarta um registro incompleto deixado por uma queda
+            n = (os.fstat(self._fd).st_size - inicio) // self.dtype.itemsize
+            os.ftruncate(self._fd, inicio + n * self.dtype.itemsize)
+            os.lseek(self._fd, 0, os.SEEK_END)
+        else:
+            self.cabecalho = {
+                'colunas': list(self.colunas),
+                'node_ids': dict(node_ids or {}),
+                'Ts': Ts,
+                'ponto_operacao': ponto_operacao,
+                'inicio': time.time(),
+            }
+            self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            os.write(self._fd, _montar_cabecalho(self.cabecalho))
+            os.fsync(self._fd)
+
+        self._pendentes = 0
+        self._ultimo_fsync = time.monotonic()
+
+    def escrever(self, *valores):
+        """Acrescenta um registro (um valor por coluna, na ordem de self.colunas)."""
+        self._registro[0] = valores
+        os.write(self._fd, self._registro.tobytes())
+        self._pendentes += 1
+        self._sincronizar_se_preciso()
+
+    def escrever_lote(self, valores):
+        """Acrescenta vários registros de uma vez: valores tem formato (n, len(colunas))."""
+        lote = np.ascontiguousarray(valores, dtype='<f8')
+        os.write(self._fd, lote.tobytes())
+        self._pendentes += len(lote)
+        self._sincronizar_se_preciso()
+
+    def _sincronizar_se_preciso(self):
+        # fsync a cada fsync_registros registros ou fsync_intervalo segundos
+        if self._pendentes and (self._pendentes >= self.fsync_registros
+                                or time.monotonic() - self._ultimo_fsync >= self.fsync_intervalo):
+            self.sincronizar()
+
+    def sincronizar(self):
+        os.fsync(self._fd)
+        self._pendentes = 0
+        self._ultimo_fsync = time.monotonic()
+
+    def fechar(self):
+        if self._fd is not None:
+            self.sincronizar()
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def abrir_registro(path, modo='r'):
+    """Mapeia o registro na memória. Retorna (cabeçalho, dados).
+
+    dados é um np.memmap estruturado com um campo por coluna: dados['pv1']
+    é uma visão do arquivo, sem cópia. Um registro incompleto no fim é ignorado.
+    """
+    lido = ler_cabecalho(path)
+    if lido is None:
+        raise ValueError(f"{path} não é um registro binário")
+    cabecalho, inicio = lido
+    dtype = _dtype(cabecalho['colunas'])
+    n = (os.path.getsize(path) - inicio) // dtype.itemsize
+    if n == 0:
+        return cabecalho, np.zeros(0, dtype=dtype)
+    return cabecalho, np.memmap(path, dtype=dtype, mode=modo, offset=inicio, shape=(n,))
+
+
+def exportar_csv(path, path_csv, bloco=100_000):
+    """Exporta o registro binário para CSV (cabeçalho com os nomes das colunas)."""
+    cabecalho, dados = abrir_registro(path)
+    with open(path_csv, 'w', newline='') as f:
+        f.write(','.join(cabecalho['colunas']) + '\n')
+        for i in range(0, len(dados), bloco):
+            bloco_dados = dados[i:i + bloco]
+            np.savetxt(f, bloco_dados.view('<f8').reshape(len(bloco_dados), -1), delimiter=',', fmt='%.17g')
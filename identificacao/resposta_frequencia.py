@@ -0,0 +1,207 @@
+"""
+    Identificação da placa térmica pela resposta em frequência
+
+    1. A resposta em frequência de cada canal é estimada a partir dos dados
+       registrados (PV/MV) por ETFE (razão das FFTs de saída e entrada) ou
+       por Welch (H1 = P_uy / P_uu, com a coerência como peso).
+    2. Os quatro canais FOPTD são ajustados juntos: estimativa inicial por
+       mínimos quadrados lineares (|G|^2 e fase) seguida de Levenberg-
+       Marquardt sobre o erro complexo, com as equações normais 3 x 3 de
+       todos os canais resolvidas em lote.
+
+    Uso:
+        dados1 = carregar_dados('malha1.bin')   # excitação em MV1
+        dados2 = carregar_dados('malha2.bin')   # excitação em MV2
+        modelo = identificar_placa(dados1, dados2, Ts=2.0, w_max=0.05)
+        A, B, C = modelo.espaco_estados()
+        A_d, B_d, C_d = discretize_system(A, B, C, 2.0)
+"""
+
+import numpy as np
+from scipy import fft, signal
+
+from foptd import FOPTD
+
+SEGMENTOS_WELCH = 3  # nperseg padrão: registro / SEGMENTOS_WELCH (5 segmentos com 50% de sobreposição)
+
+
+def etfe(u, y, Ts, nfft=None, diferenciar=True):
+    """Estimativa empírica da função de transferência Y(jw) / U(jw).
+
+    u, y: sinais com o tempo no último eixo (eixos anteriores em broadcast),
+    com o sistema em repouso no início: y é tomado relativo ao valor inicial
+    e u relativo a zero. Com diferenciar=True a razão é calculada entre
+    Δy e Δu, que voltam a zero quando a resposta se acomoda, o que evita o
+    degrau artificial no fim do registro ao completar a FFT com zeros. Para
+    isso o registro deve terminar com a resposta acomodada (ex.: alguns
+    minutos com a MV constante no fim do experimento).
+    Retorna (w [rad/s], G, |U|); |U|^2 serve de peso no ajuste.
+    """
+    u = np.asarray(u, dtype=float)
+    y = np.asarray(y, dtype=float)
+    y = y - y[..., :1]
+    if diferenciar:
+        u = np.diff(u, axis=-1, prepend=0.0)
+        y = np.diff(y, axis=-1, prepend=0.0)
+    nfft = nfft or fft.next_fast_len(2 * u.shape[-1])
+    U = fft.rfft(u, nfft)
+    Y = fft.rfft(y, nfft)
+    w = 2 * np.pi * fft.rfftfreq(nfft, Ts)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        G = Y / U
+    return w, G, np.abs(U)
+
+
+def segmento_welch(n):
+    """Comprimento padrão dos segmentos de Welch para um registro de n amostras.
+
+    A resolução em frequência é 2 pi / (nperseg Ts) e o transitório no início
+    de cada segmento enviesa H1 em ~tau / (nperseg Ts); para ajustar um FOPTD
+    os segmentos devem cobrir muitas constantes de tempo, o que na placa
+    (tau de 100 a 170 s) exige segmentos tão longos quanto o registro permite.
+    """
+    return max(n // SEGMENTOS_WELCH, 1)
+
+
+def welch(u, y, Ts, nperseg=None):
+    """Estimativa H1 = P_uy / P_uu pelo método de Welch.
+
+    nperseg: comprimento dos segmentos; por padrão segmento_welch(len(u)).
+    Um valor fixo curto em relação a tau (ex.: 256 amostras com Ts = 0,1 s,
+    25,6 s contra tau de 100 a 170 s na placa) não resolve a banda do
+    modelo e enviesa o ajuste; ao escolher nperseg, use muitas vezes tau / Ts.
+    Retorna (w [rad/s], G, coerência); a coerência serve de peso no ajuste.
+    """
+    u = np.asarray(u, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if nperseg is None:
+        nperseg = segmento_welch(u.shape[-1])
+    nperseg = min(nperseg, u.shape[-1])
+    f, P_uu = signal.welch(u, fs=1 / Ts, nperseg=nperseg, detrend='constant')
+    _, P_uy = signal.csd(u, y, fs=1 / Ts, nperseg=nperseg, detrend='constant')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        G = P_uy / P_uu
+        coerencia = np.abs(P_uy) ** 2 / (P_uu * signal.welch(y, fs=1 / Ts, nperseg=nperseg,
+                                                           detrend='constant')[1])
+    return 2 * np.pi * f, G, coerencia
+
+
+def resposta_placa(dados1, dados2, Ts, metodo='etfe', **kwargs):
+    """Resposta em frequência 2x2 da placa a partir de dois experimentos.
+
+    dados1: experimento com excitação em MV1 (fornece G11 e G21)
+    dados2: experimento com excitação em MV2 (fornece G12 e G22)
+    kwargs: repassados ao estimador (nfft no ETFE, nperseg no Welch)
+    Retorna (w, G, peso) com G e peso no formato (2, 2, len(w)).
+    """
+    estimador = {'etfe': etfe, 'welch': welch}[metodo]
+    # mesma grade de frequências para os dois experimentos
+    if metodo == 'etfe':
+        n = max(len(dados1['t']), len(dados2['t']))
+        kwargs.setdefault('nfft', fft.next_fast_len(2 * n))
+    else:
+        n = min(len(dados1['t']), len(dados2['t']))
+        kwargs.setdefault('nperseg', segmento_welch(n))
+
+    colunas = []
+    for dados, mv in ((dados1, 'mv1'), (dados2, 'mv2')):
+        y = np.stack([dados['pv1'], dados['pv2']])
+        w, G, peso = estimador(dados[mv], y, Ts, **kwargs)
+        if metodo == 'etfe':
+            peso = np.broadcast_to(peso ** 2, G.shape)
+        colunas.append((G, peso))
+    G = np.stack([c[0] for c in colunas], axis=1)
+    peso = np.stack([c[1] for c in colunas], axis=1)
+    return w, G, peso
+
+
+def _modelo(w, K, tau, theta):
+    jw = 1j * w
+    return K[..., None] * np.exp(-theta[..., None] * jw) / (1 + tau[..., None] * jw)
+
+
+def _estimativa_inicial(w, G, P):
+    """Mínimos quadrados lineares: 1/|G|^2 = 1/K^2 + (tau/K)^2 w^2 e fase = -w theta - atan(w tau)."""
+    z = 1 / np.abs(G) ** 2
+    Pz = P / z ** 2                 # pondera o erro relativo de 1/|G|^2
+    w2 = w ** 2
+    s0, s1, s2 = Pz.sum(-1), (Pz * w2).sum(-1), (Pz * w2 ** 2).sum(-1)
+    r0, r1 = (Pz * z).sum(-1), (Pz * z * w2).sum(-1)
+    det = s0 * s2 - s1 ** 2
+    a = (s2 * r0 - s1 * r1) / det
+    b = (s0 * r1 - s1 * r0) / det
+    a = np.maximum(a, 1e-12)
+    K = 1 / np.sqrt(a)
+    tau = np.sqrt(np.maximum(b, 1e-12) / a)
+
+    fase = np.unwrap(np.angle(G * np.sign(K[..., None])), axis=-1)
+    r = -fase - np.arctan(w * tau[..., None])
+    theta = np.maximum((P * w * r).sum(-1) / (P * w2).sum(-1), 0.0)
+    return K, tau, theta
+
+
+def ajustar_foptd(w, G, peso=None, w_max=None, iteracoes=50, tol=1e-10):
+    """Ajusta K, tau e theta de todos os canais de G (formato (..., len(w))).
+
+    peso: peso de cada frequência (|U|^2 no ETFE, coerência no Welch)
+    w_max: maior frequência considerada [rad/s]
+    """
+    w = np.asarray(w, dtype=float)
+    G = np.asarray(G)
+    P = np.ones(G.shape) if peso is None else np.array(np.broadcast_to(peso, G.shape), dtype=float)
+    banda = (w > 0) & np.isfinite(G).all(axis=tuple(range(G.ndim - 1)))
+    if w_max is not None:
+        banda &= w <= w_max
+    w, G, P = w[banda], G[..., banda], P[..., banda]
+    P = np.where(np.isfinite(P), P, 0.0)
+    P = P / P.sum(-1, keepdims=True)
+
+    K, tau, theta = _estimativa_inicial(w, G, P)
+
+    def custo(K, tau, theta):
+        return (P * np.abs(_modelo(w, K, tau, theta) - G) ** 2).sum(-1)
+
+    # Levenberg-Marquardt em lote: equações normais 3 x 3 por canal
+    mu = np.full(K.shape, 1e-3)
+    atual = custo(K, tau, theta)
+    for _ in range(iteracoes):
+        Gm = _modelo(w, K, tau, theta)
+        jw = 1j * w
+        J = np.stack([Gm / K[..., None], -jw * Gm / (1 + tau[..., None] * jw), -jw * Gm], axis=-1)
+        r = Gm - G
+        JhP = np.conj(J) * P[..., None]
+        H = np.real(np.einsum('...ki,...kj->...ij', JhP, J))
+        g = np.real(np.einsum('...ki,...k->...i', JhP, r))
+        H_lm = H + mu[..., None, None] * np.eye(3) * np.diagonal(H, axis1=-2, axis2=-1)[..., None, :]
+        delta = -np.linalg.solve(H_lm, g[..., None])[..., 0]
+
+        K_n = K + delta[..., 0]
+        tau_n = np.maximum(tau + delta[..., 1], 1e-9)
+        theta_n = np.maximum(theta + delta[..., 2], 0.0)
+        novo = custo(K_n, tau_n, theta_n)
+
+        melhorou = novo < atual
+        K = np.where(melhorou, K_n, K)
+        tau = np.where(melhorou, tau_n, tau)
+        theta = np.where(melhorou, theta_n, theta)
+        reducao = np.where(melhorou, (atual - novo) / np.maximum(atual, 1e-300), 0.0)
+        atual = np.where(melhorou, novo, atual)
+        mu = np.where(melhorou, mu / 3, mu * 10)
+        if np.all((reducao < tol) & melhorou | (mu > 1e10)):
+            break
+    return FOPTD(K, tau, theta)
+
+
+def identificar_placa(dados1, dados2, Ts, metodo='etfe', w_max=None, zoh=True, **kwargs):
+    """Pipeline completo: dados registrados -> resposta em frequência -> FOPTD 2x2.
+
+    zoh: as MVs são mantidas constantes entre amostras (segurador de ordem
+    zero), o que soma Ts/2 de atraso aparente; esse atraso é descontado de theta.
+    kwargs: opções do estimador; no Welch, nperseg é por padrão o mesmo para
+    os dois experimentos, segmento_welch do registro mais curto.
+    """
+    w, G, peso = resposta_placa(dados1, dados2, Ts, metodo, **kwargs)
+    modelo = ajustar_foptd(w, G, peso, w_max=w_max)
+    if zoh:
+        modelo = modelo._replace(theta=np.maximum(modelo.theta - Ts / 2, 0.0))
+    return modelo
@@ -0,0 +1,86 @@
+"""
+    Servidor OPC UA local que simula a placa térmica
+
+    Expõe os mesmos nós do servidor real (PV1, PV2, MV1, MV2) e atualiza as
+    PVs com o modelo FOPTD 2x2 identificado (foptd.PLACA), de modo que
+    peltier_controle.py, peltier_experimento.py e peltier_viewer.py possam ser
+    testados sem a planta.
+
+    Uso: python servidor_simulado.py [acelerar] [ruido]
+         (acelerar > 1 executa a simulação mais rápido que o tempo real;
+          ruido é o desvio padrão do ruído de medição somado às PVs [°C])
+"""
+
+import asyncio
+import sys
+
+import numpy as np
+from asyncua import Server, ua
+
+from opcua_io import URL_LOCAL as URL, NODE_IDS
+from foptd import PLACA, SimuladorFOPTD
+
+TS_PLANTA = 2.0       # passo de integração do modelo [s]
+T_AMBIENTE = 25.0     # temperatura inicial das placas [°C]
+
+
+class PlacaSimulada:
+    """Modelo FOPTD 2x2 discretizado exatamente (ZOH, atrasos fracionários)."""
+
+    def __init__(self, Ts=TS_PLANTA, modelo=PLACA, ruido=0.0):
+        self.modelo = SimuladorFOPTD(modelo, Ts)
+        self.ruido = ruido
+        self.rng = np.random.default_rng()
+
+    def passo(self, u):
+        """Aplica u durante um período; retorna as PVs (medidas) no fim do período."""
+        pv = T_AMBIENTE + self.modelo.passo(u)
+        if self.ruido:
+            pv += self.ruido * self.rng.standard_normal(pv.shape)
+        return pv
+
+
+async def iniciar_servidor(url=URL):
+    """Cria o servidor com os nós da placa. Retorna (server, nós)."""
+    server = Server()
+    await server.init()
+    server.set_endpoint(url)
+    idx = await server.register_namespace("PlacaTermica")
+
+    placa = await server.nodes.objects.add_object(idx, "PlacaTermica")
+    nos = {}
+    for nome, nid in NODE_IDS.items():
+        node_id = ua.NodeId.from_string(nid)
+        assert node_id.NamespaceIndex == idx, "namespace da placa deve ser ns=2"
+        inicial = T_AMBIENTE if nome.startswith('PV') else 0.0
+        nos[nome] = await placa.add_variable(node_id, nome, ua.Variant(inicial, ua.VariantType.Double))
+        await nos[nome].set_writable()
+    return server, nos
+
+
+async def simular(nos, acelerar=1.0, parar=None, ruido=0.0):
+    """Atualiza as PVs a cada TS_PLANTA / acelerar segundos até parar ser sinalizado."""
+    planta = PlacaSimulada(ruido=ruido)
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+    k = 0
+    while parar is None or not parar.is_set():
+        # a MV lida no início do período é mantida até o fim dele, quando a PV é publicada
+        u = [await nos['MV1'].read_value(), await nos['MV2'].read_value()]
+        pv = planta.passo(np.clip(u, 0.0, 100.0))
+        k += 1
+        await asyncio.sleep(max(0.0, t0 + k * TS_PLANTA / acelerar - loop.time()))
+        await nos['PV1'].write_value(float(pv[0]))
+        await nos['PV2'].write_value(float(pv[1]))
+
+
+async def main(acelerar=1.0, ruido=0.0):
+    server, nos = await iniciar_servidor()
+    async with server:
+        print(f"Servidor simulado em {URL} (acelerar = {acelerar}, ruído = {ruido} °C)")
+        await simular(nos, acelerar, ruido=ruido)
+
+
+if __name__ == "__main__":
+    argumentos = [float(a) for a in sys.argv[1:3]]
+    asyncio.run(main(*argumentos))
@@ -2,9 +2,11 @@ import asyncio
 import csv
 import signal
 import sys
+import threading
 from asyncua import Client
+from opcua_io import criar_aquisicao
+from live_plot import DataStore, LivePlot
 import matplotlib.pyplot as plt
-from datetime import datetime
 import time
 URL = "opc.tcp://localhost:48030"  # altere para seu servidor
 
@@ -13,8 +15,12 @@ NODE_PV2 = "ns=2;s=0:PlacaTermica.Malha2?PlacaTermica.Malha2.PV"
 NODE_MV1 = "ns=2;s=0:PlacaTermica.Malha1?PlacaTermica.Malha1.MV"
 NODE_MV2 = "ns=2;s=0:PlacaTermica.Malha2?PlacaTermica.Malha2.MV"
 
+REFRESH_MS = 1000   # período de redesenho do gráfico
+JANELA = 3600       # amostras exibidas (1 h a 1 amostra/s); o histórico completo vai para o CSV
+
 # Variáveis globais para dados
 times, pv1_values, pv2_values, mv1_values, mv2_values = [], [], [], [], []
+store = DataStore(JANELA)
 running = True  # flag para controlar loop
 
 def save_data_and_fig():
@@ -55,74 +61,79 @@ def signal_handler(sig, frame):
     print("\nInterrupção recebida, encerrando...")
     running = False
 
-async def main():
-    global running
-    
-    
-
+async def acquire():
+    """Aquisição OPC UA (thread de fundo): preenche o histórico e o buffer do gráfico."""
     async with Client(URL) as client:
-        pv_nodes = [client.get_node(NODE_PV1), client.get_node(NODE_PV2)]
-        mv_nodes = [client.get_node(NODE_MV1), client.get_node(NODE_MV2)]
-
-        plt.ion()
-        global fig
-        fig, (ax_pv, ax_mv) = plt.subplots(2, 1, figsize=(10, 8))
-
-        # Criar linhas vazias
-        line_pv1, = ax_pv.plot([], [], label="PV1")
-        line_pv2, = ax_pv.plot([], [], label="PV2")
-        ax_pv.set_title("PV")
-        ax_pv.set_xlabel("Time")
-        ax_pv.set_ylabel("Value")
-        ax_pv.legend()
-
-        line_mv1, = ax_mv.plot([], [], label="MV1")
-        line_mv2, = ax_mv.plot([], [], label="MV2")
-        ax_mv.set_title("MV")
-        ax_mv.set_xlabel("Time")
-        ax_mv.set_ylabel("Value")
-        ax_mv.legend()
-
-        t0 = datetime.now()
+        node_ids = {'PV1': NODE_PV1, 'PV2': NODE_PV2, 'MV1': NODE_MV1, 'MV2': NODE_MV2}
+        t0 = None
 
         while running:
             try:
-                pv_values = [await node.read_value() for node in pv_nodes]
-                mv_values = [await node.read_value() for node in mv_nodes]
-                timestamp = datetime.now()
-                minutes = (timestamp - t0).total_seconds() / 60.0
-                times.append(minutes)
-
-                pv1_values.append(pv_values[0])
-                pv2_values.append(pv_values[1])
-                mv1_values.append(mv_values[0])
-                mv2_values.append(mv_values[1])
-
-                # Atualizar linhas existentes
-                line_pv1.set_data(times, pv1_values)
-                line_pv2.set_data(times, pv2_values)
-                line_mv1.set_data(times, mv1_values)
-                line_mv2.set_data(times, mv2_values)
-
-                # Ajustar limites automaticamente
-                ax_pv.relim()
-                ax_pv.autoscale_view()
-                ax_mv.relim()
-                ax_mv.autoscale_view()
-
-                plt.pause(1)
+                # Polling em lote ou subscrição, conforme opcua_io.MODO_AQUISICAO
+                async with criar_aquisicao(client, periodo=1.0, node_ids=node_ids) as aquisicao:
+                    async for timestamp, vals in aquisicao:
+                        if not running:
+                            break
+                        if len(vals) < len(node_ids):
+                            continue  # aguarda o primeiro valor de cada nó
+                        t0 = t0 or timestamp  # carimbo de tempo do servidor
+                        minutes = (timestamp - t0).total_seconds() / 60.0
+                        times.append(minutes)
+
+                        pv1_values.append(vals['PV1'])
+                        pv2_values.append(vals['PV2'])
+                        mv1_values.append(vals['MV1'])
+                        mv2_values.append(vals['MV2'])
+                        store.add_data(vals['PV1'], vals['PV2'], vals['MV1'], vals['MV2'], t_rel=minutes)
             except Exception as e:
                 print("Erro na leitura:", e)
                 await asyncio.sleep(1)
 
-        save_data_and_fig()
 
-if __name__ == "__main__":
-    # Captura Ctrl+C
-    signal.signal(signal.SIGINT, signal_handler)
-    # Captura fechamento da janela do matplotlib
-    # plt.ion()
-    fig = plt.figure()
+def main():
+    # O gráfico é desenhado na thread principal, por um timer da figura;
+    # a corrotina de aquisição não espera pelo desenho
+    thread = threading.Thread(target=lambda: asyncio.run(acquire()), daemon=True)
+    thread.start()
+
+    fig, (ax_pv, ax_mv) = plt.subplots(2, 1, figsize=(10, 8))
     fig.canvas.mpl_connect('close_event', lambda event: signal_handler(None, None))
 
-    asyncio.run(main())
+    # Criar linhas vazias
+    line_pv1, = ax_pv.plot([], [], label="PV1")
+    line_pv2, = ax_pv.plot([], [], label="PV2")
+    ax_pv.set_title("PV")
+    ax_pv.set_xlabel("Time")
+    ax_pv.set_ylabel("Value")
+    ax_pv.legend()
+
+    line_mv1, = ax_mv.plot([], [], label="MV1")
+    line_mv2, = ax_mv.plot([], [], label="MV2")
+    ax_mv.set_title("MV")
+    ax_mv.set_xlabel("Time")
+    ax_mv.set_ylabel("Value")
+    ax_mv.legend()
+
+    grafico = LivePlot(fig, {'pv1': line_pv1, 'pv2': line_pv2, 'mv1': line_mv1, 'mv2': line_mv2},
+                       janela=JANELA / 60.0)
+    ultimo_seq = [-1]
+
+    def update():
+        seq, janela = store.snapshot()
+        if len(janela) == 0 or seq == ultimo_seq[0]:
+            return
+        ultimo_seq[0] = seq
+        grafico.update(janela['t'], {nome: janela[nome] for nome in grafico.linhas})
+
+    timer = fig.canvas.new_timer(interval=REFRESH_MS)
+    timer.add_callback(update)
+    timer.start()
+    plt.show()
+
+    thread.join(timeout=5)
+    save_data_and_fig()
+
+if __name__ == "__main__":
+    # Captura Ctrl+C e o fechamento da janela do matplotlib
+    signal.signal(signal.SIGINT, signal_handler)
+    main()
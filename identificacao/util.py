@@ -1,23 +1,96 @@
+import bisect
+from itertools import islice
+
 import numpy as np
 import matplotlib.pyplot as plt
 
-def carregar_dados(path: str):
-    raw = np.loadtxt(path, delimiter=',', skiprows=1)
-    formated = {
+from registro import abrir_registro, ler_cabecalho
+
+TAMANHO_BLOCO = 65536  # amostras por bloco na leitura em streaming
+
+def _colunas_csv(raw):
+    return {
         "t":   raw[:, 0],
         "pv1": raw[:, 1],
         "pv2": raw[:, 2],
         "mv1": raw[:, 3],
         "mv2": raw[:, 4],
     }
-    return formated
 
-def extract_range(x : dict, r):
-    start = r[0]
-    end = r[1]
-    for key in x.keys():
-        xr = x[key][start:end]
-    return xr
+def carregar_dados(path: str):
+    """
+        Carrega um experimento como {coluna: array}
+        Registros binários (registro.py) são mapeados na memória, sem cópia;
+        arquivos CSV (t, PV1, PV2, MV1, MV2) são lidos com np.loadtxt
+    """
+    if ler_cabecalho(path) is not None:
+        _, dados = abrir_registro(path)
+        return {nome: dados[nome] for nome in dados.dtype.names}
+
+    raw = np.loadtxt(path, delimiter=',', skiprows=1)
+    return _colunas_csv(raw)
+
+def iterar_blocos(path: str, tamanho=TAMANHO_BLOCO):
+    """
+        Percorre um experimento em blocos de até `tamanho` amostras ({coluna: array})
+        sem carregar o arquivo inteiro. Nos registros binários os blocos são
+        visões do arquivo mapeado; no CSV cada bloco é lido sob demanda
+    """
+    if ler_cabecalho(path) is not None:
+        _, dados = abrir_registro(path)
+        for inicio in range(0, len(dados), tamanho):
+            bloco = dados[inicio:inicio + tamanho]
+            yield {nome: bloco[nome] for nome in dados.dtype.names}
+        return
+
+    with open(path) as f:
+        f.readline()  # cabeçalho
+        while True:
+            linhas = list(islice(f, tamanho))
+            if not linhas:
+                return
+            yield _colunas_csv(np.loadtxt(linhas, delimiter=',', ndmin=2))
+
+def intervalo_tempo(dados: dict, t_ini=None, t_fim=None):
+    """
+        Visões de todas as colunas com t_ini <= t <= t_fim
+        A busca é binária sobre a coluna monotônica "t": apenas O(log n)
+        amostras de t são lidas, mesmo em um registro mapeado na memória
+    """
+    t = dados["t"]
+    inicio = 0 if t_ini is None else bisect.bisect_left(t, t_ini)
+    fim = len(t) if t_fim is None else bisect.bisect_right(t, t_fim)
+    return {chave: valores[inicio:fim] for chave, valores in dados.items()}
+
+def carregar_intervalo(path: str, t_ini=None, t_fim=None, tamanho=TAMANHO_BLOCO):
+    """
+        Carrega apenas as amostras com t_ini <= t <= t_fim
+        Registros binários: busca binária no arquivo mapeado (sem leitura do restante)
+        CSV: leitura em blocos, interrompida assim que t passa de t_fim
+    """
+    if ler_cabecalho(path) is not None:
+        return intervalo_tempo(carregar_dados(path), t_ini, t_fim)
+
+    blocos = []
+    for bloco in iterar_blocos(path, tamanho):
+        t = bloco["t"]
+        if t_ini is not None and t[-1] < t_ini:
+            continue
+        blocos.append(intervalo_tempo(bloco, t_ini, t_fim))
+        if t_fim is not None and t[-1] > t_fim:
+            break
+    if not blocos:
+        return _colunas_csv(np.zeros((0, 5)))
+    return {chave: np.concatenate([b[chave] for b in blocos]) for chave in blocos[0]}
+
+def extract_range(x, r):
+    """
+        Recorta as amostras r[0]:r[1] de um sinal ou de todas as colunas de um experimento
+    """
+    start, end = r
+    if isinstance(x, dict):
+        return {key: valores[start:end] for key, valores in x.items()}
+    return x[start:end]
 
 def plot_sinal(dados, range=None, f = None, xlabel="", ylabel="", label=""):
     """
@@ -28,7 +101,7 @@ def plot_sinal(dados, range=None, f = None, xlabel="", ylabel="", label=""):
         y = extract_range(y, range)
 
     if not f is None:
-        y = f(dados)
+        y = f(y)
 
     fig, ax = plt.subplots(1, 1)
     ax.set_ylabel(ylabel)
@@ -36,12 +109,18 @@ def plot_sinal(dados, range=None, f = None, xlabel="", ylabel="", label=""):
     ax.plot(y, label=label)
     return fig, ax
 
-def plot_pv_mv(dados, f=lambda x: x):
+def plot_pv_mv(dados, f=lambda x: x, intervalo=None):
     """
         Plota em dois gráficos distintos a PV e a MV do processo
-        @input dados dados estruturados da t, PV e MV
+        @input dados dados estruturados da t, PV e MV, ou caminho do arquivo
         @f     função de preprocessamento dos dados
+        @intervalo (t_ini, t_fim): plota apenas essa janela de tempo
     """
+    if isinstance(dados, str):
+        dados = carregar_intervalo(dados, *(intervalo or (None, None)))
+    elif intervalo is not None:
+        dados = intervalo_tempo(dados, *intervalo)
+
     fig, (ax_pv, ax_mv) = plt.subplots(2, 1, sharex=True)
     t = dados["t"]
     ax_pv.set_ylabel("Temperatura [°C]")
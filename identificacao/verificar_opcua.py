@@ -0,0 +1,77 @@
+"""
+    Verificação da camada OPC UA contra o servidor simulado
+
+    Inicia servidor_simulado (no mesmo processo, acelerado) e confere:
+      - escrita em lote das MVs (PlacaIO.escrever) seguida de leitura em lote
+        (PlacaIO.ler) devolve os valores escritos;
+      - a aquisição por leitura periódica e por subscrição (criar_aquisicao)
+        entrega as MVs escritas e a subida das PVs do modelo.
+
+    Uso: python verificar_opcua.py [acelerar]
+         (termina com código 1 se alguma verificação falhar)
+"""
+
+import asyncio
+import sys
+
+from asyncua import Client
+
+from opcua_io import URL_LOCAL as URL, PlacaIO, criar_aquisicao
+from servidor_simulado import TS_PLANTA, iniciar_servidor, simular
+
+ACELERAR = 50.0
+AMOSTRAS_MAX = 500    # amostras aguardando a resposta das PVs (cobre o atraso do modelo)
+MVS = {'MV1': 20.0, 'MV2': 35.0}
+
+
+async def verificar_ida_e_volta(client):
+    """Escreve as MVs em lote e confere a leitura em lote."""
+    io = PlacaIO(client)
+    await io.escrever(MVS)
+    vals = await io.ler()
+    assert set(vals) == {'PV1', 'PV2', 'MV1', 'MV2'}, vals
+    for nome, valor in MVS.items():
+        assert vals[nome] == valor, f"{nome}: escrito {valor}, lido {vals[nome]}"
+    print(f"ida e volta: {vals}")
+
+
+async def verificar_aquisicao(client, modo, periodo, mvs):
+    """Escreve mvs e aguarda, pelo backend modo, as MVs escritas e a subida das PVs."""
+    io = PlacaIO(client, leitura=('PV1', 'PV2'))
+    iniciais = await io.ler()
+    async with criar_aquisicao(client, periodo, modo=modo) as aquisicao:
+        await io.escrever(mvs)
+        k = 0
+        async for t, vals in aquisicao:
+            k += 1
+            if (all(vals.get(nome) == valor for nome, valor in mvs.items())
+                    and all(vals.get(pv, -1.0) > inicial for pv, inicial in iniciais.items())):
+                print(f"{modo}: {k} amostras até a resposta das PVs, t = {t}, {vals}")
+                return
+            assert k < AMOSTRAS_MAX, f"{modo}: PVs não responderam em {k} amostras: {vals}"
+
+
+async def main(acelerar=ACELERAR):
+    server, nos = await iniciar_servidor()
+    parar = asyncio.Event()
+    async with server:
+        simulacao = asyncio.create_task(simular(nos, acelerar, parar))
+        try:
+            async with Client(url=URL) as client:
+                await verificar_ida_e_volta(client)
+                # MVs maiores a cada backend, para que as PVs voltem a subir
+                for i, modo in enumerate(('polling', 'subscription')):
+                    mvs = {nome: valor + 10.0 * (i + 1) for nome, valor in MVS.items()}
+                    await verificar_aquisicao(client, modo, TS_PLANTA / acelerar, mvs)
+        finally:
+            parar.set()
+            await simulacao
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main(*[float(a) for a in sys.argv[1:2]]))
+    except AssertionError as erro:
+        print(f"FALHOU: {erro}")
+        sys.exit(1)
+    print("OK")
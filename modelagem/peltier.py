@@ -0,0 +1,60 @@
+"""
+    Modelo da placa termoelétrica (Peltier)
+
+    Parâmetros físicos e linearização usados em peltier.ipynb. As funções
+    aceitam arrays de pontos de operação (broadcast do numpy), o que permite
+    linearizar uma grade inteira de uma vez.
+"""
+
+import numpy as np
+
+params = {
+    "peltier_coef": 53e-5,
+    "eletric_res": 1e-5,
+    "L": 0.0025,
+    "Am": 0.00145,
+    "n": 127,
+    "termical_cond": 1.2,
+    "Mc": 0.05,
+    "Mh": 0.05,
+    "Ml": 0.34,
+    "Mf": 0.6,
+    "Cc": 1000,
+    "Ch": 1000,
+    "Cl": 400,
+    "Cf": 850,
+    "gamma": 200,
+    "Rth": 0.25,
+    "Ta": 25,
+    "C": 700
+}
+
+
+def peltier_linear_dynamic(x_e, u_e, params):
+    M_l = params["Ml"]
+    C_l = params["Cl"]
+    M_h = params["Mh"]
+    C_h = params["Ch"]
+    k = params["termical_cond"]
+    A_m = params["Am"]
+    L = params["L"]
+    n = params["n"]
+    alpha = params["peltier_coef"]
+
+    I_e = u_e
+    T_le = x_e
+
+    beta = M_l*C_l + M_h*C_h
+
+    A = (1.0/beta)*(-k*A_m/L - n*alpha*I_e)
+    B = (1.0/beta)*(-n*alpha*T_le)
+    C = 1.0
+
+    return A, B, C
+
+
+def peltier_linear_model(T_le, I_e, params=params):
+    """Modelo linearizado em (T_le, I_e) como matrizes (A, B, C) de espaço de estados."""
+    A, B, C = peltier_linear_dynamic(x_e=T_le, u_e=I_e, params=params)
+    A, B = np.broadcast_arrays(A, B)
+    return A[..., None, None], B[..., None, None], np.full(np.shape(A) + (1, 1), C)
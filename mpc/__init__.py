@@ -0,0 +1,28 @@
+"""
+    Controle preditivo baseado em modelo (DMPC) no espaço de estados.
+
+    core:       discretização, modelo aumentado, matrizes de predição e ganhos
+    qp:         solução do problema com restrições pelo método de Hildreth
+    basis:      parametrização de ΔU por blocos de movimento ou funções de Laguerre
+    sparse:     formulação não condensada (Riccati e KKT esparso) para horizontes longos
+    simulation: simulação em malha fechada de vários cenários
+    scheduling: tabela de ganhos por ponto de operação
+    delay:      modelo FOPTD com tempo morto e cadeias de atraso compartilhadas
+    frequency:  norma H∞ e varreduras de ganho x frequência em lote
+    estimator:  observador por alocação de polos e filtro de Kalman em regime permanente
+    explicit:   MPC explícito (lei afim por partes calculada offline)
+    profiling:  instrumentação opcional de tempo (cronômetros, histogramas, trace)
+"""
+
+from .core import (discretize_system, discretize_batch, augmented_system, compute_FPhi,
+                   DMPC, get_controller, clear_gain_cache, mpc_gains)
+from .qp import HildrethQP, HildrethSolver, DMPCSolver, QPResult, constraint_matrices
+from .basis import move_blocking, laguerre, laguerre_functions
+from .sparse import SparseDMPC, choose_formulation
+from .simulation import simulate, SimulationResult
+from .scheduling import GainSchedule
+from .delay import DelaySystem, zoh_delay_coefficients
+from .frequency import peak_gain, hinf_norm
+from .estimator import StateEstimator, place_observer, kalman_gain, clear_kalman_cache
+from .explicit import ExplicitMPC
+from . import profiling
@@ -0,0 +1,83 @@
+"""
+    Parametrização da trajetória de controle ΔU = L η
+
+    No DMPC padrão o vetor de decisão tem N_c m movimentos Δu. Com uma base
+    L (N_c m x n_η) os movimentos passam a ser combinações de poucos
+    coeficientes η, e as matrizes de predição ficam
+
+        Y = F x(k) + (Phi L) η
+
+    de modo que Phi'Phi, a hessiana e o QP de Hildreth são n_η x n_η em vez
+    de N_c m x N_c m. As restrições continuam escritas em ΔU
+    (constraint_matrices) e são levadas para η por M L.
+
+    move_blocking: Δu só muda no início de cada bloco (u constante dentro do
+                   bloco); blocos curtos no início e longos no fim mantêm a
+                   resposta rápida com poucos movimentos.
+    laguerre:      funções de Laguerre discretas (Wang, 2009), ortonormais
+                   em [0, ∞); o polo a ajusta a velocidade de decaimento de
+                   Δu e poucas funções descrevem movimentos suaves em um
+                   horizonte longo. Com a = 0 as funções são pulsos e a base
+                   reproduz o DMPC com N_c = N.
+
+    Ambas ordenam as linhas como ΔU = [Δu(k); Δu(k+1); ...] (m entradas por
+    instante) e aceitam parâmetros por entrada. Exemplo:
+
+        L = laguerre(N_c=40, a=0.7, N=4, m=2)
+        dmpc = get_controller(A, B, C, N_p=60, N_c=40, r_w=0.1, basis=L)
+"""
+
+import numpy as np
+
+
+def _por_entrada(valor, m, tipo):
+    """Parâmetro escalar ou um por entrada, como array de formato (m,)."""
+    return np.broadcast_to(np.asarray(valor, dtype=tipo), (m,))
+
+
+def laguerre_functions(N_c, a, N):
+    """Funções de Laguerre discretas l_1 ... l_N em k = 0 ... N_c - 1, formato (N_c, N).
+
+    L(k + 1) = A_l L(k), com L(0) = sqrt(β) [1, -a, a^2, ..., (-a)^(N-1)],
+    β = 1 - a^2 e A_l triangular inferior com a na diagonal e
+    (-a)^(i-j-1) β abaixo dela.
+    """
+    if not 0 <= a < 1:
+        raise ValueError("O polo de Laguerre deve estar em [0, 1)")
+    beta = 1 - a * a
+    potencias = (-a) ** np.arange(N)
+    i, j = np.indices((N, N))
+    A_l = np.where(i > j, potencias[np.maximum(i - j - 1, 0)] * beta, 0.0) + a * np.eye(N)
+
+    funcoes = np.empty((N_c, N))
+    funcoes[0] = np.sqrt(beta) * potencias
+    for k in range(1, N_c):
+        funcoes[k] = A_l @ funcoes[k - 1]
+    return funcoes
+
+
+def laguerre(N_c, a, N, m=1):
+    """Base L (N_c m x sum(N)) de Laguerre; a e N escalares ou por entrada."""
+    a = _por_entrada(a, m, np.float64)
+    N = _por_entrada(N, m, np.intp)
+    L = np.zeros((N_c, m, int(N.sum())))
+    inicio = 0
+    for j in range(m):
+        L[:, j, inicio:inicio + N[j]] = laguerre_functions(N_c, a[j], N[j])
+        inicio += N[j]
+    return L.reshape(N_c * m, -1)
+
+
+def move_blocking(N_c, blocks, m=1):
+    """Base L (N_c m x len(blocks) m) com movimentos apenas no início de cada bloco.
+
+    blocks: comprimentos dos blocos em amostras, com soma até N_c (após o
+            último bloco Δu = 0), ex.: (1, 1, 2, 4, 12) para N_c = 20.
+    """
+    blocks = np.asarray(blocks, dtype=np.intp)
+    if np.any(blocks < 1) or blocks.sum() > N_c:
+        raise ValueError("Os blocos devem ter comprimento >= 1 e soma até N_c")
+    inicios = np.concatenate([[0], np.cumsum(blocks[:-1])])
+    L = np.zeros((N_c, m, len(blocks), m))
+    L[inicios, :, np.arange(len(blocks)), :] = np.eye(m)
+    return L.reshape(N_c * m, len(blocks) * m)
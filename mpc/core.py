@@ -0,0 +1,268 @@
+from collections import OrderedDict
+
+from scipy.linalg import expm # função para calcular a exponencial de matrizes
+from scipy.linalg import cho_factor, cho_solve
+
+from numpy import *
+
+from .profiling import timed, timer
+
+GAIN_CACHE_SIZE = 32  # número máximo de controladores mantidos em cache
+
+def _van_loan(A, B, T, Q=None):
+    """Discretização exata por uma única exponencial de matriz em blocos.
+
+    Sem Q:  expm([[A, B], [0, 0]] T) = [[A_d, B_d], [0, I]].
+    Com Q (Van Loan), a exponencial de
+
+        Z = [[0, 0, B'], [0, -A, Q], [0, 0, A']] T
+
+    contém B_d' no bloco (1, 3), G no bloco (2, 3) e A_d' no bloco (3, 3),
+    com Q_d = A_d G = integral de e^(As) Q e^(A's) ds em [0, T].
+    Aceita pilhas de modelos com formato (..., n, n).
+    """
+    A = asarray(A, dtype=float64)
+    B = asarray(B, dtype=float64)
+    n = A.shape[-1]
+    m = B.shape[-1]
+    pilha = broadcast_shapes(A.shape[:-2], B.shape[:-2])
+
+    if Q is None:
+        Z = zeros(pilha + (n + m, n + m))
+        Z[..., :n, :n] = A
+        Z[..., :n, n:] = B
+        E = expm(Z * T)
+        return E[..., :n, :n], E[..., :n, n:]
+
+    Q = asarray(Q, dtype=float64)
+    pilha = broadcast_shapes(pilha, Q.shape[:-2])
+    At = swapaxes(A, -1, -2)
+    Z = zeros(pilha + (m + 2 * n, m + 2 * n))
+    Z[..., :m, m + n:] = swapaxes(B, -1, -2)
+    Z[..., m:m + n, m:m + n] = -A
+    Z[..., m:m + n, m + n:] = Q
+    Z[..., m + n:, m + n:] = At
+    E = expm(Z * T)
+
+    A_d = swapaxes(E[..., m + n:, m + n:], -1, -2)
+    B_d = swapaxes(E[..., :m, m + n:], -1, -2)
+    Q_d = A_d @ E[..., m:m + n, m + n:]
+    Q_d = 0.5 * (Q_d + swapaxes(Q_d, -1, -2))  # simetria numérica
+    return A_d, B_d, Q_d
+
+@timed('discretize')
+def discretize_system(A, B, C, T, Q=None):
+    """Discretiza o sistema contínuo com período de amostragem T.
+
+    A discretização (ZOH) é exata e não exige A inversível. Se a covariância
+    Q do ruído de processo contínuo for fornecida, retorna também Q_d.
+    """
+    if Q is None:
+        A_d, B_d = _van_loan(A, B, T)
+        return A_d, B_d, C  # C permanece o mesmo
+
+    A_d, B_d, Q_d = _van_loan(A, B, T, Q)
+    return A_d, B_d, C, Q_d
+
+@timed('discretize')
+def discretize_batch(A, B, T, Q=None):
+    """Discretiza uma pilha de modelos (K, n, n), (K, n, m) em uma chamada.
+
+    Retorna (A_d, B_d) ou (A_d, B_d, Q_d), também empilhados.
+    """
+    return _van_loan(A, B, T, Q)
+
+def augmented_system(A_m, B_m, C_m):
+    """Monta o modelo aumentado [Δx_m(k); y(k)] para q saídas e m entradas."""
+    n = A_m.shape[0]        # número de estados do sistema
+    q = C_m.shape[0]        # número de saídas do sistema
+    o_m = zeros((q, n))
+    _1 = eye(q)
+    # para concatenar matrizes em python, usar hstack e vstack
+
+    A = vstack([
+        hstack([A_m, o_m.T]),      # Parte superior de A
+        hstack([C_m @ A_m, _1]) # Parte inferior de A
+    ])
+
+    B = vstack([
+        B_m,
+        C_m @ B_m
+    ])
+
+    C = hstack([o_m, _1])
+    return A, B, C
+
+def _potencias_CA(A, C, N):
+    """Retorna a pilha [C, C A, C A^2, ..., C A^N] com formato (N + 1, q, n).
+
+    Cada termo é obtido do anterior por um único produto (C A^k) A, evitando
+    recalcular potências de A. O custo total é O(N q n²).
+    """
+    q, n = C.shape
+    CA = empty((N + 1, q, n))
+    CA[0] = C
+    for k in range(N):
+        CA[k + 1] = CA[k] @ A
+    return CA
+
+@timed('FPhi')
+def compute_FPhi(A, B, C, N_p, N_c, basis=None):
+    """Calcula as matrizes de predição F e Phi do DMPC.
+
+    Y = F x(k) + Phi ΔU, com F de dimensão (N_p q, n) e Phi de dimensão
+    (N_p q, N_c m). F é formada pelos produtos C A^(i+1) e Phi pelos parâmetros
+    de Markov C A^(i-c) B, ambos extraídos da mesma sequência C A^k.
+
+    basis: base L (N_c m x n_η) de basis.py; retorna Phi L, para ΔU = L η.
+    """
+    A = atleast_2d(asarray(A, dtype=float64))
+    B = atleast_2d(asarray(B, dtype=float64))
+    C = atleast_2d(asarray(C, dtype=float64))
+    n = A.shape[0]
+    q = C.shape[0]
+    m = B.shape[1]
+
+    CA = _potencias_CA(A, C, N_p)
+    F = CA[1:].reshape(N_p * q, n)
+    Phi = _toeplitz_Phi(CA[:N_p] @ B, N_c)
+    if basis is not None:
+        Phi = Phi @ basis
+
+    return F, Phi
+
+def _toeplitz_Phi(markov, N_c):
+    """Monta Phi a partir dos parâmetros de Markov C A^k B, k = 0 ... N_p - 1 (formato (N_p, q, m))."""
+    N_p, q, m = markov.shape
+
+    # sequência precedida de N_c - 1 blocos nulos para a parte acima da diagonal
+    seq = zeros((N_p + N_c - 1, q, m))
+    seq[N_c - 1:] = markov
+
+    # Phi é bloco-Toeplitz: o bloco (i, c) é C A^(i-c) B. A janela deslizante
+    # sobre a sequência de Markov é uma visão (sem cópia) com formato
+    # (N_p, q, m, N_c), cujo índice j corresponde a c = N_c - 1 - j
+    janelas = lib.stride_tricks.sliding_window_view(seq, N_c, axis=0)
+
+    Phi = empty((N_p * q, N_c * m))
+    Phi.reshape(N_p, q, N_c, m)[...] = janelas[..., ::-1].transpose(0, 1, 3, 2)
+    return Phi
+
+class DMPC:
+    """Controlador DMPC sem restrições com ganhos pré-calculados.
+
+    A matriz Phi'Phi + R_barra é fatorada (Cholesky) uma única vez e os ganhos
+    de horizonte deslizante (Ky, Kx) correspondem às m primeiras linhas de
+    (Phi'Phi + R_barra)^-1 Phi' [R_s, F]. A lei de controle por amostra é
+
+        Δu(k) = Ky r(k) - Kx x(k)
+
+    FPhi: (F, Phi) já calculadas para (A, B, C), ex.: por um modelo com
+    estrutura própria (DelaySystem); por padrão usa compute_FPhi.
+
+    basis: base L (N_c m x n_η) de basis.py, ΔU = L η. Phi passa a ser Phi L,
+    o peso R_barra = r_w L'L penaliza os mesmos movimentos e a fatoração e o
+    QP ficam em η. delta_U e os ganhos continuam em ΔU; coefficients dá η.
+    """
+
+    def __init__(self, A, B, C, N_p, N_c, r_w, FPhi=None, basis=None):
+        self.A = A
+        self.B = B
+        self.C = C
+        self.N_p = N_p
+        self.N_c = N_c
+        self.r_w = r_w
+        self.n = A.shape[0]
+        self.m = B.shape[1]
+        self.q = C.shape[0]
+
+        self.basis = basis
+        if FPhi is None:
+            self.F, self.Phi = compute_FPhi(A, B, C, N_p, N_c, basis)
+        else:
+            self.F, self.Phi = FPhi
+            if basis is not None:
+                self.Phi = self.Phi @ basis
+        self.R_barra = r_w * (eye(N_c * self.m) if basis is None else basis.T @ basis)
+        self.R_s = tile(eye(self.q), (N_p, 1))  # R_s r(k) repete r(k) no horizonte
+        with timer('gains'):
+            self.fator = cho_factor(self.Phi.T @ self.Phi + self.R_barra)
+
+            # ganhos de todo o horizonte: η = K_eta [r; -x] e ΔU = K_U [r; -x]
+            self.K_eta = cho_solve(self.fator, self.Phi.T @ hstack([self.R_s, self.F]))
+            self.K_U = self.K_eta if basis is None else basis @ self.K_eta
+        self.Ky = self.K_U[:self.m, :self.q].copy()
+        self.Kx = self.K_U[:self.m, self.q:].copy()
+
+    def _referencia(self, x, r):
+        r = asarray(r, dtype=float64)
+        if r.ndim == 0:  # referência escalar aplicada a todas as saídas
+            r = full((self.q,) + shape(x)[1:], r)
+        return r
+
+    def delta_u(self, x, r):
+        """Incremento de controle Δu(k) aplicado à planta."""
+        return self.Ky @ self._referencia(x, r) - self.Kx @ x
+
+    def delta_U(self, x, r):
+        """Trajetória ótima ΔU completa no horizonte de controle."""
+        return self.K_U[:, :self.q] @ self._referencia(x, r) - self.K_U[:, self.q:] @ x
+
+    def coefficients(self, x, r):
+        """Vetor de decisão η ótimo (igual a ΔU quando não há base)."""
+        if self.basis is None:
+            return self.delta_U(x, r)
+        return self.K_eta[:, :self.q] @ self._referencia(x, r) - self.K_eta[:, self.q:] @ x
+
+    def solve_hessian(self, b):
+        """E^-1 b, com E = 2 (Phi'Phi + R_barra) a hessiana do QP na variável de decisão."""
+        return 0.5 * cho_solve(self.fator, b)
+
+_controladores = OrderedDict()
+
+def _chave(A, B, C, N_p, N_c, r_w, formulation, basis=None):
+    matrizes = tuple((M.shape, M.tobytes()) for M in (A, B, C) + (() if basis is None else (basis,)))
+    return matrizes + (int(N_p), int(N_c), float(r_w), formulation)
+
+def get_controller(A, B, C, N_p, N_c, r_w, FPhi=None, formulation='auto', basis=None):
+    """Retorna o DMPC de (A, B, C, N_p, N_c, r_w), reaproveitando o cache LRU.
+
+    formulation: 'condensed' (DMPC), 'sparse' (sparse.SparseDMPC) ou 'auto',
+    que escolhe a de menor custo de montagem pelas dimensões do problema.
+    FPhi, se fornecido, implica a forma condensada e é usado apenas quando o
+    controlador ainda não está no cache. basis (ΔU = L η, basis.py) também
+    implica a forma condensada.
+    """
+    from .sparse import SparseDMPC, choose_formulation  # sparse depende de core
+
+    A = atleast_2d(asarray(A, dtype=float64))
+    B = atleast_2d(asarray(B, dtype=float64))
+    C = atleast_2d(asarray(C, dtype=float64))
+    if basis is not None:
+        basis = atleast_2d(asarray(basis, dtype=float64))
+    if FPhi is not None or basis is not None:
+        formulation = 'condensed'
+    elif formulation == 'auto':
+        formulation = choose_formulation(A.shape[0], B.shape[1], C.shape[0], N_p, N_c)
+    chave = _chave(A, B, C, N_p, N_c, r_w, formulation, basis)
+    if chave in _controladores:
+        _controladores.move_to_end(chave)
+        return _controladores[chave]
+
+    if formulation == 'sparse':
+        controlador = SparseDMPC(A, B, C, N_p, N_c, r_w)
+    else:
+        controlador = DMPC(A, B, C, N_p, N_c, r_w, FPhi, basis)
+    _controladores[chave] = controlador
+    while len(_controladores) > GAIN_CACHE_SIZE:
+        _controladores.popitem(last=False)  # remove o usado há mais tempo
+    return controlador
+
+def clear_gain_cache():
+    """Esvazia o cache de controladores."""
+    _controladores.clear()
+
+def mpc_gains(A, B, C, N_p, N_c, r_w, basis=None):
+    """Ganhos (Ky, Kx) do DMPC sem restrições."""
+    controlador = get_controller(A, B, C, N_p, N_c, r_w, basis=basis)
+    return controlador.Ky, controlador.Kx
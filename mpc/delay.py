@@ -0,0 +1,158 @@
+"""
+    Modelo com tempo morto para o DMPC a partir de parâmetros FOPTD
+
+        G_ij(s) = K_ij / (1 + s tau_ij) e^(-theta_ij s)
+
+    Cada canal é discretizado exatamente com segurador de ordem zero. Com
+    theta = (d + eps) T, 0 <= eps < 1 (transformada z modificada):
+
+        x_ij(k+1) = a x_ij(k) + b0 u_j(k-d) + b1 u_j(k-d-1)
+
+    As entradas passadas ficam em uma cadeia de atraso por entrada,
+    compartilhada por todos os canais alimentados por ela, em vez de uma
+    cadeia por canal. O estado é
+
+        x = [x_11 ... x_qm | u_1(k-1) ... u_1(k-D_1) | ... | u_m(k-1) ... u_m(k-D_m)]
+
+    As matrizes de predição não usam produtos densos com A: a sequência
+    C A^k tem forma fechada pela estrutura do modelo (canais diagonais e
+    cadeias que apenas deslocam valores) e custa O(N q n) em vez de O(N q n²).
+
+    Exemplo (placa térmica, Ts = 2 s):
+
+        sistema = DelaySystem(GANHOS, CONSTANTES, ATRASOS, T=2.0)
+        A_m, B_m, C_m = sistema.matrices()
+        dmpc = sistema.controller(N_p=60, N_c=5, r_w=1.0)
+"""
+
+import numpy as np
+
+from .core import _toeplitz_Phi, augmented_system, get_controller
+from .profiling import timed
+
+
+def zoh_delay_coefficients(K, tau, theta, T):
+    """Coeficientes da discretização exata (ZOH) de K e^(-theta s) / (1 + s tau).
+
+    Com theta = (d + eps) T, 0 <= eps < 1, o canal segue
+        x(k+1) = a x(k) + b0 u(k-d) + b1 u(k-d-1)
+        a = e^(-T/tau),  b0 = K (1 - e^(-(1-eps) T/tau)),  b1 = K (e^(-(1-eps) T/tau) - a)
+    Aceita matrizes de canais; retorna (d, a, b0, b1) no formato de K.
+    """
+    K, tau, theta = (np.atleast_2d(np.asarray(p, dtype=np.float64)) for p in (K, tau, theta))
+    atraso = theta / T
+    d = np.floor(atraso + 1e-9).astype(int)
+    eps = np.clip(atraso - d, 0.0, 1.0)
+    a = np.exp(-T / tau)
+    e = np.exp(-(1 - eps) * T / tau)
+    return d, a, K * (1 - e), K * (e - a)
+
+
+class DelaySystem:
+    """Modelo FOPTD MIMO discreto com cadeias de atraso compartilhadas por entrada."""
+
+    def __init__(self, K, tau, theta, T):
+        self.d, self.a, self.b0, self.b1 = zoh_delay_coefficients(K, tau, theta, T)
+        self.q, self.m = self.d.shape
+        self.T = T
+
+        # posições da cadeia usadas por canal: u(k-d) em d-1 e u(k-d-1) em d
+        usadas = np.where(self.b1 != 0, self.d + 1, self.d)
+        self.D = usadas.max(axis=0)                      # comprimento da cadeia de cada entrada
+        self.n_ch = self.q * self.m
+        self.inicio = self.n_ch + np.concatenate([[0], np.cumsum(self.D)[:-1]]).astype(int)
+        self.n = self.n_ch + int(self.D.sum())
+
+        # acoplamento canais <- cadeias (A_cz) e entrada direta dos canais sem atraso
+        canal = np.arange(self.n_ch)
+        j = canal % self.m
+        d, b0, b1 = self.d.ravel(), self.b0.ravel(), self.b1.ravel()
+        self._A_cz = np.zeros((self.n_ch, self.n - self.n_ch))
+        com_atraso = d >= 1
+        self._A_cz[canal[com_atraso], self.inicio[j[com_atraso]] + d[com_atraso] - 1 - self.n_ch] = b0[com_atraso]
+        com_b1 = b1 != 0
+        self._A_cz[canal[com_b1], self.inicio[j[com_b1]] + d[com_b1] - self.n_ch] = b1[com_b1]
+        self._B_ch = np.zeros((self.n_ch, self.m))
+        self._B_ch[canal[~com_atraso], j[~com_atraso]] = b0[~com_atraso]
+
+    def matrices(self):
+        """(A_m, B_m, C_m) discretos e explícitos, com n = q m + sum(D) estados."""
+        n, n_ch = self.n, self.n_ch
+        A = np.zeros((n, n))
+        A[:n_ch, :n_ch] = np.diag(self.a.ravel())
+        A[:n_ch, n_ch:] = self._A_cz
+        B = np.zeros((n, self.m))
+        B[:n_ch] = self._B_ch
+        for j in range(self.m):
+            p = self.inicio[j]
+            if self.D[j]:
+                B[p, j] = 1.0
+                A[p + 1:p + self.D[j], p:p + self.D[j] - 1] = np.eye(self.D[j] - 1)
+        C = np.zeros((self.q, n))
+        C[:, :n_ch] = np.kron(np.eye(self.q), np.ones(self.m))
+        return A, B, C
+
+    def CA_powers(self, N):
+        """Pilha [C, C A, ..., C A^N] (formato (N + 1, q, n)) pela estrutura do modelo.
+
+        Como a saída i depende apenas dos canais (i, j), a pilha tem forma
+        fechada: a coluna do canal (i, j) vale a^k e a posição p da cadeia
+        da entrada j vale b0 a^(k - (d - p)) a partir de k = d - p (quando o
+        valor chega à derivação de b0), mais o termo análogo de b1 em
+        k = d + 1 - p. Cada coluna da cadeia é a sequência b a^k deslocada,
+        então o bloco inteiro é uma janela deslizante sobre essa sequência,
+        sem produtos com A.
+        """
+        q, m, n_ch = self.q, self.m, self.n_ch
+        k = np.arange(N + 1)
+        potencias = self.a[..., None] ** k                 # (q, m, N + 1)
+        CA = np.zeros((N + 1, q, self.n))
+        for i in range(q):
+            CA[:, i, i * m:(i + 1) * m] = potencias[i].T
+
+        for j in range(m):
+            D = self.D[j]
+            bloco = CA[:, :, self.inicio[j]:self.inicio[j] + D]
+            for i in range(q):
+                d = self.d[i, j]
+                for b, desloc in ((self.b0[i, j], 0), (self.b1[i, j], 1)):
+                    corte = min(d + desloc, D)             # posições que ainda não passaram pela derivação
+                    if b == 0 or corte == 0:
+                        continue
+                    # seq[D + t] = b a^t (t >= 0), zeros antes; coluna p usa t = k - (d + desloc - p)
+                    seq = np.zeros(2 * D + N + 1)
+                    seq[D:D + N + 1] = b * potencias[i, j]
+                    janelas = np.lib.stride_tricks.sliding_window_view(seq, D)
+                    inicio = D - d - desloc
+                    bloco[:, i, :corte] += janelas[inicio:inicio + N + 1, :corte]
+        return CA
+
+    def _markov_planta(self, CA):
+        """C_m A_m^k B_m a partir da pilha C_m A_m^k (apenas as colunas não nulas de B_m)."""
+        n_ch = self.n_ch
+        markov = CA[:, :, :n_ch] @ self._B_ch
+        for j in range(self.m):
+            if self.D[j]:
+                markov[:, :, j] += CA[:, :, self.inicio[j]]
+        return markov
+
+    @timed('FPhi')
+    def FPhi(self, N_p, N_c):
+        """F e Phi do modelo aumentado [Δx_m; y], iguais a
+        compute_FPhi(*augmented_system(*self.matrices()), N_p, N_c).
+
+        Para o modelo aumentado, C A^k = [sum_{l=1..k} C_m A_m^l, I] e
+        C A^k B = sum_{l=0..k} C_m A_m^l B_m, obtidos por somas acumuladas.
+        """
+        q = self.q
+        CA = self.CA_powers(N_p)
+        F = np.empty((N_p, q, self.n + q))
+        F[:, :, :self.n] = np.cumsum(CA[1:], axis=0)
+        F[:, :, self.n:] = np.eye(q)
+        markov = np.cumsum(self._markov_planta(CA[:N_p]), axis=0)
+        return F.reshape(N_p * q, self.n + q), _toeplitz_Phi(markov, N_c)
+
+    def controller(self, N_p, N_c, r_w):
+        """DMPC do modelo aumentado, com F e Phi calculadas pela estrutura do modelo."""
+        A, B, C = augmented_system(*self.matrices())
+        return get_controller(A, B, C, N_p, N_c, r_w, FPhi=self.FPhi(N_p, N_c))
@@ -0,0 +1,150 @@
+"""
+    Estimação de estados para o DMPC
+
+    O estimador usa a forma atual (filtro): a estimativa x(k|k) incorpora a
+    medição y(k) antes do cálculo de Δu(k). Predição e correção são fundidas
+    em uma única atualização com matrizes pré-calculadas,
+
+        x(k|k) = (I - M C) A x(k-1|k-1) + (I - M C) B u(k-1) + M y(k)
+               = A_e x + B_e u + M y,
+
+    cujo erro de estimação evolui com (I - M C) A. O ganho M pode vir de:
+
+    place_observer: alocação de polos (Ackermann para uma saída, de qualquer
+                    ordem; scipy.signal.place_poles para várias saídas)
+    kalman_gain:    filtro de Kalman em regime permanente (DARE), resolvido
+                    uma vez e mantido em cache LRU, como os ganhos do DMPC
+
+    Exemplo (modelo aumentado do DMPC, ruído de medição com variância R):
+
+        A, B, C = augmented_system(A_m, B_m, C_m)
+        estimador = StateEstimator.kalman(A, B, C, Q=1e-3 * eye(A.shape[0]), R=0.01 * eye(C.shape[0]))
+        x = estimador.update(y, du)          # a cada amostra
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve, solve_discrete_are
+from scipy.signal import place_poles
+
+KALMAN_CACHE_SIZE = 32  # número máximo de ganhos de Kalman mantidos em cache
+
+
+def _ackermann(A, C, poles):
+    """Ganho L (n x 1) com autovalores de A - L C em poles, para uma saída.
+
+    L = P(A) W_o^-1 e_n, com P o polinômio característico desejado
+    (avaliado por Horner) e W_o = [C; C A; ...; C A^(n-1)].
+    """
+    n = A.shape[0]
+    coef = np.real(np.poly(poles))
+    P = np.zeros((n, n))
+    for c in coef:
+        P = P @ A + c * np.eye(n)
+
+    W_o = np.empty((n, n))
+    W_o[0] = C[0]
+    for k in range(1, n):
+        W_o[k] = W_o[k - 1] @ A
+    e_n = np.zeros((n, 1))
+    e_n[-1] = 1.0
+    return P @ np.linalg.solve(W_o, e_n)
+
+
+def place_observer(A, C, poles, current=True):
+    """Ganho do observador com os polos do erro de estimação em poles.
+
+    current=True:  M da forma atual, autovalores de (I - M C) A
+    current=False: L da forma preditora x(k+1) = A x + B u + L (y - C x),
+                   autovalores de A - L C (como em lista_mpc.ipynb)
+    """
+    A = np.atleast_2d(np.asarray(A, dtype=np.float64))
+    C = np.atleast_2d(np.asarray(C, dtype=np.float64))
+    # (I - M C) A = A - M (C A): mesma alocação com o par (A, C A)
+    C_o = C @ A if current else C
+    if C.shape[0] == 1:
+        return _ackermann(A, C_o, poles)
+    return place_poles(A.T, C_o.T, poles).gain_matrix.T
+
+
+_ganhos_kalman = OrderedDict()
+
+
+def kalman_gain(A, C, Q, R):
+    """Ganho de Kalman em regime permanente (M, P) da forma atual.
+
+    P é a covariância a priori, solução de
+        P = A P A' - A P C' (C P C' + R)^-1 C P A' + Q
+    e M = P C' (C P C' + R)^-1. O resultado fica em cache LRU.
+    """
+    A, C, Q, R = (np.atleast_2d(np.asarray(M, dtype=np.float64)) for M in (A, C, Q, R))
+    chave = tuple((M.shape, M.tobytes()) for M in (A, C, Q, R))
+    if chave in _ganhos_kalman:
+        _ganhos_kalman.move_to_end(chave)
+        return _ganhos_kalman[chave]
+
+    P = solve_discrete_are(A.T, C.T, Q, R)
+    S = cho_factor(C @ P @ C.T + R)
+    M = cho_solve(S, C @ P).T
+    _ganhos_kalman[chave] = (M, P)
+    while len(_ganhos_kalman) > KALMAN_CACHE_SIZE:
+        _ganhos_kalman.popitem(last=False)
+    return M, P
+
+
+def clear_kalman_cache():
+    """Esvazia o cache de ganhos de Kalman."""
+    _ganhos_kalman.clear()
+
+
+class StateEstimator:
+    """Estimador de estados na forma atual com atualização sem alocação.
+
+    O estado e os vetores intermediários são pré-alocados; update() escreve
+    neles com np.dot(..., out=) e devolve o próprio vetor de estado, que é
+    sobrescrito na amostra seguinte (copie-o se precisar guardar o valor).
+    Para evitar conversões, passe y e u como arrays float64 contíguos.
+    """
+
+    def __init__(self, A, B, C, M, x0=None):
+        A, B, C, M = (np.atleast_2d(np.asarray(X, dtype=np.float64)) for X in (A, B, C, M))
+        self.n, self.m = B.shape
+        self.q = C.shape[0]
+        self.M = M
+        I_MC = np.eye(self.n) - M @ C
+        self.A_e = I_MC @ A
+        self.B_e = I_MC @ B
+        self.x = np.zeros(self.n)
+        self._x = np.empty(self.n)
+        self._tmp = np.empty(self.n)
+        self.reset(x0)
+
+    @classmethod
+    def kalman(cls, A, B, C, Q, R, x0=None):
+        """Estimador com o ganho de Kalman em regime permanente (cache)."""
+        M, _ = kalman_gain(A, C, Q, R)
+        return cls(A, B, C, M, x0)
+
+    @classmethod
+    def place(cls, A, B, C, poles, x0=None):
+        """Estimador com os polos do erro de estimação em poles."""
+        return cls(A, B, C, place_observer(A, C, poles), x0)
+
+    def reset(self, x0=None):
+        """Reinicia a estimativa (zero por padrão)."""
+        if x0 is None:
+            self.x.fill(0.0)
+        else:
+            self.x[...] = x0
+
+    def update(self, y, u):
+        """x(k|k) a partir de y(k) e da entrada u(k-1) aplicada no período anterior."""
+        x, tmp = self._x, self._tmp
+        np.dot(self.A_e, self.x, out=x)
+        np.dot(self.B_e, u, out=tmp)
+        x += tmp
+        np.dot(self.M, y, out=tmp)
+        x += tmp
+        self._x, self.x = self.x, x
+        return x
@@ -0,0 +1,192 @@
+"""
+    MPC explícito: solução multiparamétrica do QP do DMPC calculada offline
+
+    Com restrições M ΔU <= gamma0 + S u(k-1), o QP de cada amostra
+
+        min 1/2 ΔU'E ΔU + ΔU'f    f = f_x x(k) + f_r r(k)
+
+    depende apenas do parâmetro theta = [x(k); r(k); u(k-1)]. Para cada
+    conjunto de restrições ativas A (com linhas de M_A linearmente
+    independentes) as condições de KKT dão uma lei afim
+
+        ΔU = K_A theta + k_A
+
+    válida na região crítica {theta : H_A theta <= h_A}, formada por λ_A >= 0
+    e pelas restrições inativas satisfeitas. As regiões não vazias são
+    encontradas offline por enumeração dos conjuntos ativos em ordem de
+    cardinalidade; um conjunto cujas restrições não podem estar ativas juntas
+    (problema primal inviável) elimina todos os seus superconjuntos.
+
+    Online, a lei é avaliada por localização do ponto: a região da amostra
+    anterior é testada primeiro e, se theta saiu dela, todas as regiões são
+    testadas de uma vez com um único produto sobre as desigualdades
+    empilhadas (H de todas as regiões em um único array, com deslocamentos).
+
+    O número de regiões cresce combinatoriamente com o número de restrições;
+    o modo explícito é indicado para restrições apenas no primeiro movimento
+    (apply='first' em constraint_matrices), como no laço da placa térmica.
+"""
+
+from itertools import count
+
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve
+from scipy.optimize import linprog
+
+from .profiling import timed
+
+
+def _regiao_nao_vazia(H, h, tol):
+    """Centro de Chebyshev de {H theta <= h} com raio limitado a 1: a região tem interior?"""
+    if len(H) == 0:
+        return True
+    normas = np.linalg.norm(H, axis=1)
+    p = H.shape[1]
+    c = np.zeros(p + 1)
+    c[-1] = -1.0                                      # maximiza o raio
+    A_ub = np.hstack([H, normas[:, None]])
+    res = linprog(c, A_ub=A_ub, b_ub=h, bounds=[(None, None)] * p + [(0.0, 1.0)], method='highs')
+    return res.status == 0 and -res.fun > tol
+
+
+def _ativas_compativeis(M, Sg, g0, ativas):
+    """Existem (ΔU, theta) com M_A ΔU = gamma_A(theta) e M ΔU <= gamma(theta)?"""
+    nz, p = M.shape[1], Sg.shape[1]
+    G = np.hstack([M, -Sg])                           # M ΔU - S theta <= gamma0
+    A = list(ativas)
+    res = linprog(np.zeros(nz + p), A_ub=G, b_ub=g0, A_eq=G[A], b_eq=g0[A],
+                  bounds=[(None, None)] * (nz + p), method='highs')
+    return res.status == 0
+
+
+class ExplicitMPC:
+    """Lei de controle afim por partes do DMPC com restrições.
+
+    dmpc: controlador DMPC (F, Phi, R_barra, R_s); com uma base ΔU = L η
+          (dmpc.basis) as regiões são calculadas em η, com menos variáveis
+    M, gamma0, S: restrições M ΔU <= gamma0 + S u(k-1) (constraint_matrices)
+    max_active: maior número de restrições ativas simultâneas consideradas
+    """
+
+    @timed('explicit.build')
+    def __init__(self, dmpc, M, gamma0, S, max_active=None, tol=1e-9):
+        self.dmpc = dmpc
+        self.tol = tol
+        n, q, m = dmpc.n, dmpc.q, dmpc.m
+        self.n_theta = n + q + m
+        M = np.atleast_2d(np.asarray(M, dtype=np.float64))
+        g0 = np.asarray(gamma0, dtype=np.float64).reshape(-1)
+        S = np.asarray(S, dtype=np.float64).reshape(len(g0), m)
+        basis = getattr(dmpc, 'basis', None)
+        if basis is not None:
+            M = M @ basis
+
+        # QP em theta = [x; r; u(k-1)]: f = F_t theta e gamma = g0 + S_t theta
+        E = 2 * (dmpc.Phi.T @ dmpc.Phi + dmpc.R_barra)
+        F_t = np.hstack([2 * dmpc.Phi.T @ dmpc.F, -2 * dmpc.Phi.T @ dmpc.R_s, np.zeros((E.shape[0], m))])
+        S_t = np.hstack([np.zeros((len(g0), n + q)), S])
+        fator = cho_factor(E)
+        E_inv_F = cho_solve(fator, F_t)
+
+        leis, regioes = [], []
+        nivel = [()]
+        limite = min(E.shape[0], len(g0)) if max_active is None else max_active
+        for tamanho in count():
+            proximo = []
+            for ativas in nivel:
+                lei = self._regiao(M, g0, S_t, fator, E_inv_F, ativas)
+                if lei is not None:
+                    leis.append(lei[:2])
+                    regioes.append(lei[2:])
+                if tamanho == limite:
+                    continue
+                # extensões com índices maiores, se as restrições podem estar ativas juntas
+                for j in range((ativas[-1] + 1) if ativas else 0, len(g0)):
+                    novo = ativas + (j,)
+                    if np.linalg.matrix_rank(M[list(novo)]) == len(novo) and \
+                            _ativas_compativeis(M, S_t, g0, novo):
+                        proximo.append(novo)
+            if not proximo:
+                break
+            nivel = proximo
+
+        self.K = np.stack([k for k, _ in leis])                  # (R, N_c m, n_theta)
+        self.k0 = np.stack([k0 for _, k0 in leis])               # (R, N_c m)
+        if basis is not None:                                    # leis em ΔU = L η
+            self.K = basis @ self.K
+            self.k0 = self.k0 @ basis.T
+        self.H = np.vstack([H for H, _ in regioes])              # desigualdades empilhadas
+        self.h = np.concatenate([h for _, h in regioes])
+        self.fim = np.cumsum([len(h) for _, h in regioes]).astype(np.intp)
+        self.inicio = np.concatenate([[0], self.fim[:-1]]).astype(np.intp)
+        self._margem = self.h + tol * (1 + np.abs(self.h))
+        self._com_linhas = self.fim > self.inicio
+        self.ultima = 0
+
+    def _regiao(self, M, g0, S_t, fator, E_inv_F, ativas):
+        """(K, k0, H, h) do conjunto ativo, ou None se a região crítica for vazia."""
+        A = list(ativas)
+        inativas = np.setdiff1d(np.arange(len(g0)), A)
+        K, k0 = -E_inv_F, np.zeros(E_inv_F.shape[0])
+        linhas_H, linhas_h = [], []
+        if A:
+            M_A = M[A]
+            E_inv_MAt = cho_solve(fator, M_A.T)
+            G = M_A @ E_inv_MAt
+            # λ_A = -G^-1 (gamma_A + M_A E^-1 f) = L theta + l0
+            L = -np.linalg.solve(G, S_t[A] + M_A @ E_inv_F)
+            l0 = -np.linalg.solve(G, g0[A])
+            K = K - E_inv_MAt @ L
+            k0 = k0 - E_inv_MAt @ l0
+            linhas_H.append(-L)
+            linhas_h.append(l0)
+        # restrições inativas: M_I (K theta + k0) <= g0_I + S_I theta
+        linhas_H.append(M[inativas] @ K - S_t[inativas])
+        linhas_h.append(g0[inativas] - M[inativas] @ k0)
+        H, h = np.vstack(linhas_H), np.concatenate(linhas_h)
+
+        # linhas nulas são sempre satisfeitas (h >= 0) ou tornam a região vazia
+        nulas = np.linalg.norm(H, axis=1) <= self.tol
+        if np.any(h[nulas] < -self.tol):
+            return None
+        H, h = H[~nulas], h[~nulas]
+        if not _regiao_nao_vazia(H, h, self.tol):
+            return None
+        return K, k0, H, h
+
+    @property
+    def n_regions(self):
+        return len(self.K)
+
+    def _theta(self, x, r, u_prev):
+        r = self.dmpc._referencia(x, r)
+        return np.concatenate([np.ravel(x), np.ravel(r), np.ravel(u_prev)])
+
+    def locate(self, theta):
+        """Índice da região crítica que contém theta, ou -1 (QP inviável / fora das regiões)."""
+        a, b = self.inicio[self.ultima], self.fim[self.ultima]
+        if np.all(self.H[a:b] @ theta <= self._margem[a:b]):
+            return self.ultima
+
+        folga = self.H @ theta - self._margem
+        pior = np.zeros(self.n_regions)                 # região sem linhas: todo o espaço
+        if folga.size:
+            pior[self._com_linhas] = np.maximum.reduceat(folga, self.inicio[self._com_linhas])
+        dentro = np.flatnonzero(pior <= 0)
+        if len(dentro) == 0:
+            return -1
+        self.ultima = dentro[0]
+        return self.ultima
+
+    def delta_U(self, x, r, u_prev):
+        """Trajetória ΔU ótima (igual à do QP online) ou None fora das regiões."""
+        theta = self._theta(x, r, u_prev)
+        i = self.locate(theta)
+        if i < 0:
+            return None
+        return self.K[i] @ theta + self.k0[i]
+
+    def delta_u(self, x, r, u_prev):
+        """Incremento Δu(k) aplicado à planta, ou None fora das regiões."""
+        dU = self.delta_U(x, r, u_prev)
+        return None if dU is None else dU[:self.dmpc.m]
@@ -0,0 +1,252 @@
+"""
+    Instrumentação opcional (perfil de tempo) do pipeline do DMPC
+
+    Cronômetros por contexto ou decorador, valores (ex.: iterações do QP) e
+    contadores, agregados por nome em histogramas logarítmicos. Desligada por
+    padrão: timer() devolve um contexto nulo compartilhado e as funções
+    decoradas com timed() fazem apenas um teste de flag antes da chamada
+    original, de modo que o custo sem perfil é de algumas centenas de ns.
+
+    Pontos instrumentados no pacote e nos scripts da placa:
+
+        discretize    discretize_system / discretize_batch
+        FPhi          compute_FPhi / DelaySystem.FPhi
+        gains         fatoração e ganhos do DMPC (Riccati em SparseDMPC)
+        kkt           fatoração do KKT esparso
+        qp            HildrethSolver.solve_from; qp.iterations com as iterações
+        opcua.read    PlacaIO.ler_datavalues (identificacao/opcua_io.py)
+        opcua.write   PlacaIO.escrever
+
+    Uso:
+        profiling.enable(trace=True)
+        ...                                    # laço de controle
+        print(profiling.summary(budget=2.0))   # fração do período Ts por etapa
+        profiling.export_json("perfil.json")   # resumo, histogramas e trace
+        profiling.export_trace("perfil.csv")   # um evento por linha: t, nome, valor
+"""
+
+import csv
+import functools
+import inspect
+import json
+import math
+import time
+
+DECADAS = (-9, 6)       # faixa do histograma: 1e-9 a 1e6 (segundos ou unidades do valor)
+BINS_POR_DECADA = 20    # resolução de ~12% nos percentis
+
+_ativo = False
+_rastro = None          # lista de (t, nome, valor) quando o trace está ligado
+_medidas = {}
+_contadores = {}
+_t0 = time.perf_counter()
+
+
+class Measure:
+    """Estatísticas de um nome: n, soma, mínimo, máximo e histograma logarítmico.
+
+    O bin 0 recebe valores <= 10^DECADAS[0] (inclusive zero) e o último,
+    valores acima de 10^DECADAS[1].
+    """
+
+    __slots__ = ('name', 'is_time', 'n', 'total', 'minimum', 'maximum', 'histogram')
+
+    def __init__(self, name, is_time):
+        self.name = name
+        self.is_time = is_time
+        self.n = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.histogram = [0] * ((DECADAS[1] - DECADAS[0]) * BINS_POR_DECADA + 2)
+
+    def add(self, valor):
+        self.n += 1
+        self.total += valor
+        if valor < self.minimum:
+            self.minimum = valor
+        if valor > self.maximum:
+            self.maximum = valor
+        i = 0
+        if valor > 0:
+            i = int(math.ceil((math.log10(valor) - DECADAS[0]) * BINS_POR_DECADA))
+            i = min(max(i, 0), len(self.histogram) - 1)
+        self.histogram[i] += 1
+
+    @property
+    def mean(self):
+        return self.total / self.n if self.n else math.nan
+
+    def percentile(self, p):
+        """Percentil p (0-100) aproximado pelo limite superior do bin, limitado ao máximo."""
+        if not self.n:
+            return math.nan
+        alvo = p / 100.0 * self.n
+        acumulado = 0
+        for i, contagem in enumerate(self.histogram):
+            acumulado += contagem
+            if acumulado >= alvo and contagem:
+                limite = 10.0 ** (DECADAS[0] + i / BINS_POR_DECADA)
+                return min(max(limite, self.minimum), self.maximum)
+        return self.maximum
+
+    def as_dict(self):
+        return {'n': self.n, 'time': self.is_time, 'total': self.total, 'mean': self.mean,
+                'min': self.minimum, 'max': self.maximum, 'p50': self.percentile(50),
+                'p99': self.percentile(99), 'histogram': self.histogram}
+
+
+def enable(trace=False):
+    """Liga a instrumentação; com trace=True guarda também cada evento."""
+    global _ativo, _rastro
+    _ativo = True
+    _rastro = [] if trace else None
+
+
+def disable():
+    """Desliga a instrumentação (as estatísticas acumuladas são mantidas)."""
+    global _ativo
+    _ativo = False
+
+
+def is_enabled():
+    return _ativo
+
+
+def reset():
+    """Descarta estatísticas, contadores e trace."""
+    global _t0
+    _medidas.clear()
+    _contadores.clear()
+    if _rastro is not None:
+        _rastro.clear()
+    _t0 = time.perf_counter()
+
+
+def _registrar(nome, valor, is_time, t):
+    medida = _medidas.get(nome)
+    if medida is None:
+        medida = _medidas[nome] = Measure(nome, is_time)
+    medida.add(valor)
+    if _rastro is not None:
+        _rastro.append((t - _t0, nome, valor))
+
+
+def record(name, value):
+    """Registra um valor (ex.: iterações do QP) no histograma de name."""
+    if _ativo:
+        _registrar(name, float(value), False, time.perf_counter())
+
+
+def count(name, n=1):
+    """Incrementa o contador name."""
+    if _ativo:
+        _contadores[name] = _contadores.get(name, 0) + n
+
+
+class _Cronometro:
+    __slots__ = ('nome', 'inicio')
+
+    def __init__(self, nome):
+        self.nome = nome
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _registrar(self.nome, time.perf_counter() - self.inicio, True, self.inicio)
+        return False
+
+
+class _Nulo:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULO = _Nulo()
+
+
+def timer(name):
+    """Contexto que mede a duração do bloco em name (nulo com a instrumentação desligada)."""
+    return _Cronometro(name) if _ativo else _NULO
+
+
+def timed(name=None):
+    """Decorador que mede cada chamada da função (síncrona ou async) em name."""
+    def decorador(f):
+        nome = name or f.__qualname__
+
+        if inspect.iscoroutinefunction(f):
+            @functools.wraps(f)
+            async def envoltorio(*args, **kwargs):
+                if not _ativo:
+                    return await f(*args, **kwargs)
+                inicio = time.perf_counter()
+                try:
+                    return await f(*args, **kwargs)
+                finally:
+                    _registrar(nome, time.perf_counter() - inicio, True, inicio)
+        else:
+            @functools.wraps(f)
+            def envoltorio(*args, **kwargs):
+                if not _ativo:
+                    return f(*args, **kwargs)
+                inicio = time.perf_counter()
+                try:
+                    return f(*args, **kwargs)
+                finally:
+                    _registrar(nome, time.perf_counter() - inicio, True, inicio)
+        return envoltorio
+    return decorador
+
+
+def snapshot():
+    """Estado atual: {'measures': {nome: estatísticas}, 'counters': {...}, 'trace': [...] ou None}."""
+    return {'measures': {nome: m.as_dict() for nome, m in _medidas.items()},
+            'counters': dict(_contadores),
+            'trace': None if _rastro is None else [list(evento) for evento in _rastro]}
+
+
+def summary(budget=None):
+    """Tabela com n, média, p50, p99, máximo e total por nome.
+
+    budget: período de amostragem [s]; acrescenta a fração média do período
+    gasta em cada etapa medida.
+    """
+    linhas = [f"{'nome':>16} {'n':>7} {'média':>10} {'p50':>10} {'p99':>10} {'máx':>10} {'total':>10}"
+              + (f" {'% Ts':>7}" if budget else "")]
+    for nome, m in sorted(_medidas.items()):
+        if m.is_time:
+            valores = [f"{1e3 * v:8.3f}ms" for v in (m.mean, m.percentile(50), m.percentile(99), m.maximum)]
+            linha = f"{nome:>16} {m.n:7d} " + " ".join(valores) + f" {m.total:9.4f}s"
+            if budget:
+                linha += f" {100 * m.mean / budget:6.2f}%"
+        else:
+            valores = [f"{v:10.4g}" for v in (m.mean, m.percentile(50), m.percentile(99), m.maximum, m.total)]
+            linha = f"{nome:>16} {m.n:7d} " + " ".join(valores)
+        linhas.append(linha)
+    for nome, n in sorted(_contadores.items()):
+        linhas.append(f"{nome:>16} {n:7d}")
+    return "\n".join(linhas)
+
+
+def export_json(path):
+    """Salva snapshot() em JSON."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot(), f, ensure_ascii=False, indent=1)
+
+
+def export_trace(path):
+    """Salva o trace (um evento por linha: t [s], nome, valor) em CSV."""
+    if _rastro is None:
+        raise RuntimeError("Trace desligado: use profiling.enable(trace=True)")
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        escritor = csv.writer(f)
+        escritor.writerow(('t', 'nome', 'valor'))
+        escritor.writerows(_rastro)
@@ -0,0 +1,194 @@
+"""
+    Programação quadrática pelo método de Hildreth
+
+        min J = 1/2 x'Ex + x'f    sujeito a  Mx <= gamma
+
+    O problema dual é resolvido por Gauss-Seidel sobre os multiplicadores λ.
+    Quando E e M são constantes (caso típico do DMPC), H = M E^-1 M' é
+    calculada uma única vez e λ é reaproveitado entre amostras (warm start).
+
+    DMPCSolver resolve o QP do DMPC diretamente em função de (x, r), usando
+    o ótimo irrestrito e a hessiana do próprio controlador, de modo que a
+    mesma chamada vale para a forma condensada, para a esparsa e para ΔU
+    parametrizado por uma base (basis.py).
+"""
+
+from collections import namedtuple
+
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve
+
+from .profiling import record, timed
+
+try:  # numba é opcional, apenas acelera a varredura de Gauss-Seidel
+    from numba import njit
+except ImportError:
+    njit = None
+
+QPResult = namedtuple("QPResult", ["x", "lambda_", "iterations", "converged"])
+
+
+def _varredura(H, K, lam):
+    """Uma varredura de Gauss-Seidel sobre λ (in-place).
+
+    Para cada restrição i, w = H[i, :i] λ_novo[:i] + H[i, i+1:] λ_velho[i+1:] + K[i].
+    Como λ é atualizado in-place, H[i] @ λ já mistura os valores novos e velhos;
+    basta descontar o termo diagonal. Retorna a maior variação de λ.
+    """
+    delta = 0.0
+    for i in range(lam.shape[0]):
+        w = H[i] @ lam - H[i, i] * lam[i] + K[i]
+        novo = max(0.0, -w / H[i, i])
+        delta = max(delta, abs(novo - lam[i]))
+        lam[i] = novo
+    return delta
+
+
+if njit is not None:
+    _varredura = njit(cache=True)(_varredura)
+
+
+class HildrethSolver:
+    """Solver de Hildreth com E e M fixos.
+
+    E^-1 (via Cholesky), E^-1 M' e H = M E^-1 M' são calculados na construção.
+    Cada chamada a solve() recebe apenas f e gamma, que variam a cada amostra.
+
+    E_inv_Mt: E^-1 M' já calculado (ex.: DMPCSolver); com E = None não há
+    fatoração de E e apenas solve_from, que recebe o ótimo irrestrito, é usado.
+    """
+
+    def __init__(self, E, M, p_max=100, tol=1e-10, warm_start=True, E_inv_Mt=None):
+        self.E = None if E is None else np.atleast_2d(np.asarray(E, dtype=np.float64))
+        self.M = np.atleast_2d(np.asarray(M, dtype=np.float64))
+        self.p_max = p_max
+        self.tol = tol
+        self.warm_start = warm_start
+
+        self.fator = None if self.E is None else cho_factor(self.E)
+        if E_inv_Mt is None:
+            if self.fator is None:
+                raise ValueError("É preciso fornecer E ou E_inv_Mt")
+            E_inv_Mt = cho_solve(self.fator, self.M.T)
+        self.E_inv_Mt = np.asarray(E_inv_Mt, dtype=np.float64)
+        self.H = np.ascontiguousarray(self.M @ self.E_inv_Mt)
+        self.lambda_ = np.zeros(self.M.shape[0])
+
+    def reset(self):
+        """Descarta o λ da amostra anterior."""
+        self.lambda_[:] = 0.0
+
+    def solve(self, f, gamma):
+        if self.fator is None:
+            raise ValueError("Solver criado sem E (apenas E_inv_Mt): use solve_from(-E^-1 f, gamma)")
+        f = np.asarray(f, dtype=np.float64)
+        return self.solve_from(-cho_solve(self.fator, f.reshape(-1)), gamma, f.shape)
+
+    @timed('qp')
+    def solve_from(self, x_opt, gamma, forma=None):
+        """Ótimo com restrições a partir do ótimo irrestrito x_opt = -E^-1 f."""
+        x_opt = np.asarray(x_opt, dtype=np.float64).reshape(-1)
+        forma = x_opt.shape if forma is None else forma
+        gamma = np.asarray(gamma, dtype=np.float64).reshape(-1)
+
+        # Verifica se o ponto ótimo irrestrito satisfaz as restrições
+        K = gamma - self.M @ x_opt
+        if np.all(K >= 0):
+            self.lambda_[:] = 0.0
+            record('qp.iterations', 0)
+            return QPResult(x_opt.reshape(forma), self.lambda_.copy(), 0, True)
+
+        # Caso contrário, calcula o ótimo pelo método de Hildreth
+        if not self.warm_start:
+            self.lambda_[:] = 0.0
+        lam = self.lambda_
+        convergiu = False
+        p = 0
+        for p in range(1, self.p_max + 1):
+            if _varredura(self.H, K, lam) < self.tol:
+                convergiu = True
+                break
+
+        record('qp.iterations', p)
+        x = x_opt - self.E_inv_Mt @ lam
+        return QPResult(x.reshape(forma), lam.copy(), p, convergiu)
+
+
+class DMPCSolver:
+    """QP do DMPC com restrições M ΔU <= gamma, em função do estado e da referência.
+
+    controller: DMPC ou SparseDMPC; E^-1 M' vem de controller.solve_hessian
+    (calculado uma vez) e o ótimo irrestrito de controller.coefficients(x, r).
+
+    Se o controlador tem uma base ΔU = L η (basis.py), o QP é resolvido em η
+    com as restrições M L η <= gamma. Linhas nulas de M L são descartadas e
+    linhas repetidas (ex.: movimentos do mesmo bloco) são unidas, ficando com
+    o menor gamma do grupo; λ do resultado se refere às linhas restantes.
+    """
+
+    def __init__(self, controller, M, **kwargs):
+        self.controller = controller
+        self.M = np.atleast_2d(np.asarray(M, dtype=np.float64))
+        self.basis = getattr(controller, 'basis', None)
+        M_eta = self.M
+        if self.basis is not None:
+            M_eta = self.M @ self.basis
+            validas = np.flatnonzero(np.abs(M_eta).max(axis=1) > 0)
+            _, grupo = np.unique(M_eta[validas].round(12), axis=0, return_inverse=True)
+            ordem = np.argsort(grupo.ravel(), kind='stable')
+            self._linhas = validas[ordem]
+            self._inicios = np.flatnonzero(np.diff(grupo.ravel()[ordem], prepend=-1))
+            M_eta = M_eta[self._linhas[self._inicios]]
+        self.hildreth = HildrethSolver(None, M_eta, E_inv_Mt=controller.solve_hessian(M_eta.T), **kwargs)
+
+    def reset(self):
+        self.hildreth.reset()
+
+    def solve(self, x, r, gamma):
+        """QPResult com a trajetória ΔU ótima para o estado x e a referência r."""
+        if self.basis is None:
+            return self.hildreth.solve_from(self.controller.delta_U(x, r), gamma)
+        gamma = np.minimum.reduceat(np.asarray(gamma, dtype=np.float64).reshape(-1)[self._linhas],
+                                    self._inicios)
+        eta, lam, p, convergiu = self.hildreth.solve_from(self.controller.coefficients(x, r), gamma)
+        return QPResult(self.basis @ eta, lam, p, convergiu)
+
+
+def HildrethQP(C, d, G, h, p_max=10, v=0):
+    """
+        J = 1/2 x'Cx + d'x
+
+        subject to Gx <= h
+    """
+    resultado = HildrethSolver(C, G, p_max=p_max, warm_start=False).solve(d, h)
+    if v > 0 and resultado.iterations:
+        estado = "Convergiu" if resultado.converged else "Não convergiu"
+        print(f"{estado} em {resultado.iterations} iterações")
+    return resultado.x
+
+
+def constraint_matrices(N_c, du_range, u_range, m=1, apply='first'):
+    """Restrições em Δu e u na forma M ΔU <= gamma0 + S u(k-1).
+
+    du_range e u_range são pares (min, max), escalares ou por entrada.
+    Com apply='first' apenas o primeiro movimento Δu(k) é restrito; com
+    apply='all' a restrição vale em todo o horizonte de controle e com um
+    inteiro N, nas N primeiras amostras (útil com ΔU parametrizado por uma
+    base, em que N_c é longo e o número de restrições define o tamanho do
+    problema dual). Retorna (M, gamma0, S).
+    """
+    du_min, du_max = (np.broadcast_to(np.asarray(v, dtype=np.float64), (m,)) for v in du_range)
+    u_min, u_max = (np.broadcast_to(np.asarray(v, dtype=np.float64), (m,)) for v in u_range)
+
+    N = N_c if apply == 'all' else 1 if apply == 'first' else min(int(apply), N_c)
+    I = np.eye(N * m, N_c * m)
+    T = np.kron(np.tril(np.ones((N, N_c))), np.eye(m))   # u(k+i) = u(k-1) + soma dos Δu
+    M = np.vstack([I, -I, T, -T])
+
+    gamma0 = np.concatenate([np.tile(du_max, N), -np.tile(du_min, N),
+                             np.tile(u_max, N), -np.tile(u_min, N)])
+
+    # termo u(k-1), que só aparece nas restrições de amplitude
+    uns = np.kron(np.ones((N, 1)), np.eye(m))
+    S = np.vstack([np.zeros((2 * N * m, m)), -uns, uns])
+    return M, gamma0, S
@@ -0,0 +1,139 @@
+"""
+    Escalonamento de ganhos do DMPC por ponto de operação
+
+    Os modelos linearizados são discretizados, aumentados e convertidos em
+    F, Phi e ganhos (Ky, Kx) para toda uma grade de pontos de operação, fora
+    do laço de controle. A grade é uniforme em cada eixo, de modo que a
+    consulta online (ponto mais próximo ou interpolação multilinear) custa
+    O(1) e nunca relineariza o modelo.
+
+    Exemplo (placa Peltier, uma entrada e uma saída):
+
+        from modelagem.peltier import peltier_linear_model
+        tabela = GainSchedule.build(peltier_linear_model,
+                                    [linspace(280, 330, 51), linspace(0, 6, 25)],
+                                    T=2.0, N_p=60, N_c=5, r_w=0.1)
+        tabela.save("ganhos_peltier")
+        tabela = GainSchedule.load("ganhos_peltier")   # memory-mapped
+        Ky, Kx = tabela.gains(T_le, I_e)
+"""
+
+import itertools
+import json
+import os
+
+import numpy as np
+
+from .core import DMPC, augmented_system, discretize_batch
+
+TABLES = ("A", "B", "C", "F", "Phi", "Ky", "Kx")
+
+
+class GainSchedule:
+    """Tabela de modelos e ganhos indexada por uma grade uniforme de pontos de operação."""
+
+    def __init__(self, axes, tables, meta=None):
+        self.axes = [np.asarray(eixo, dtype=np.float64) for eixo in axes]
+        self.tables = tables
+        self.meta = meta or {}
+        self.shape = tuple(len(eixo) for eixo in self.axes)
+
+        self._inicio = [float(eixo[0]) for eixo in self.axes]
+        self._passo = [float(eixo[1] - eixo[0]) if len(eixo) > 1 else 1.0
+                       for eixo in self.axes]
+        for eixo, passo in zip(self.axes, self._passo):
+            if len(eixo) > 1 and not np.allclose(np.diff(eixo), passo):
+                raise ValueError("Os eixos da grade de operação devem ser uniformes")
+
+    @classmethod
+    def build(cls, linearize, axes, T, N_p, N_c, r_w, vectorized=True):
+        """Calcula a tabela para todos os pontos da grade.
+
+        linearize(*op) recebe as coordenadas do ponto de operação e retorna o
+        modelo contínuo (A, B, C). Com vectorized=True ela recebe a grade
+        inteira e retorna pilhas (..., n, n); caso contrário é chamada ponto a
+        ponto.
+        """
+        axes = [np.asarray(eixo, dtype=np.float64) for eixo in axes]
+        grade = np.meshgrid(*axes, indexing="ij")
+        forma = grade[0].shape
+
+        if vectorized:
+            A_c, B_c, C_c = (np.asarray(M, dtype=np.float64) for M in linearize(*grade))
+        else:
+            modelos = [[np.atleast_2d(M) for M in linearize(*op)]
+                       for op in zip(*(g.ravel() for g in grade))]
+            A_c, B_c, C_c = (np.stack([mod[i] for mod in modelos]).reshape(
+                forma + modelos[0][i].shape) for i in range(3))
+        C_c = np.broadcast_to(C_c, forma + C_c.shape[-2:])
+
+        A_d, B_d = discretize_batch(A_c, B_c, T)
+
+        pontos = int(np.prod(forma))
+        controladores = []
+        for A_m, B_m, C_m in zip(A_d.reshape((pontos,) + A_d.shape[-2:]),
+                                 B_d.reshape((pontos,) + B_d.shape[-2:]),
+                                 C_c.reshape((pontos,) + C_c.shape[-2:])):
+            controladores.append(DMPC(*augmented_system(A_m, B_m, C_m), N_p, N_c, r_w))
+
+        tables = {nome: np.stack([getattr(c, nome) for c in controladores]).reshape(
+                      forma + getattr(controladores[0], nome).shape)
+                  for nome in TABLES}
+        meta = {"T": T, "N_p": N_p, "N_c": N_c, "r_w": r_w}
+        return cls(axes, tables, meta)
+
+    def save(self, path):
+        """Grava a tabela em um diretório com um .npy por matriz."""
+        os.makedirs(path, exist_ok=True)
+        for i, eixo in enumerate(self.axes):
+            np.save(os.path.join(path, f"eixo{i}.npy"), eixo)
+        for nome, tabela in self.tables.items():
+            np.save(os.path.join(path, f"{nome}.npy"), tabela)
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump(dict(self.meta, n_eixos=len(self.axes)), f, indent=2)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Carrega a tabela gravada por save(); com mmap=True as matrizes não são lidas para a memória."""
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        axes = [np.load(os.path.join(path, f"eixo{i}.npy")) for i in range(meta.pop("n_eixos"))]
+        modo = "r" if mmap else None
+        tables = {nome: np.load(os.path.join(path, f"{nome}.npy"), mmap_mode=modo)
+                  for nome in TABLES if os.path.exists(os.path.join(path, f"{nome}.npy"))}
+        return cls(axes, tables, meta)
+
+    def index(self, *op):
+        """Índice do ponto da grade mais próximo de op."""
+        return tuple(min(max(int(round((x - x0) / dx)), 0), N - 1)
+                     for x, x0, dx, N in zip(op, self._inicio, self._passo, self.shape))
+
+    def nearest(self, name, *op):
+        """Entrada da tabela name no ponto de grade mais próximo de op."""
+        return self.tables[name][self.index(*op)]
+
+    def interpolate(self, name, *op):
+        """Interpolação multilinear da tabela name em op (2^d entradas lidas)."""
+        base = []
+        pesos = []
+        for x, x0, dx, N in zip(op, self._inicio, self._passo, self.shape):
+            t = min(max((x - x0) / dx, 0.0), N - 1.0)
+            i0 = min(int(t), max(N - 2, 0))
+            base.append(i0)
+            pesos.append(t - i0)
+        tabela = self.tables[name]
+
+        resultado = 0.0
+        for canto in itertools.product((0, 1), repeat=len(base)):
+            peso = 1.0
+            for c, w in zip(canto, pesos):
+                peso *= w if c else 1.0 - w
+            if peso == 0.0:
+                continue
+            resultado = resultado + peso * tabela[tuple(i + c for i, c in zip(base, canto))]
+        return resultado
+
+    def gains(self, *op, interpolate=True):
+        """Ganhos (Ky, Kx) no ponto de operação op."""
+        consulta = self.interpolate if interpolate else self.nearest
+        return consulta("Ky", *op), consulta("Kx", *op)
@@ -0,0 +1,150 @@
+"""
+    Simulação em malha fechada do DMPC
+
+    Vários cenários (referências, pesos r_w, perturbações, condições iniciais)
+    são simulados ao mesmo tempo ao longo do primeiro eixo dos arrays. Sem
+    restrições a lei de controle é aplicada a todos os cenários por einsum;
+    com restrições cada cenário mantém o seu próprio λ (warm start) e
+    compartilha H com os demais cenários de mesmo r_w.
+"""
+
+import copy
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .core import get_controller
+from .qp import DMPCSolver
+
+SimulationResult = namedtuple("SimulationResult", ["x", "y", "du", "u", "iterations"])
+
+
+def _por_cenario(valor, S, forma):
+    """Expande valor para o formato (S,) + forma."""
+    valor = np.asarray(valor, dtype=np.float64)
+    if valor.ndim <= len(forma):
+        valor = valor[np.newaxis]
+    return np.broadcast_to(valor, (S,) + forma)
+
+
+def _referencia(r, q):
+    """Referência com os formatos aceitos por simulate, como array.
+
+    Um vetor (S,) com q = 1 (um setpoint constante por cenário) passa a
+    (S, 1, 1); os demais formatos são mantidos para o broadcast.
+    """
+    r = np.asarray(r, dtype=np.float64)
+    if r.ndim == 1 and r.shape[0] != q:
+        if q != 1:
+            raise ValueError(f"Referência com formato {r.shape} para q = {q} saídas: use (q,), "
+                             f"(k_total, q) ou (S, k_total, q), com (S, 1, q) para um setpoint por cenário")
+        r = r[:, np.newaxis, np.newaxis]
+    if r.ndim > 3:
+        raise ValueError(f"Referência com formato {r.shape}: no máximo (S, k_total, q)")
+    return r
+
+
+def _n_cenarios(r, r_w, disturbance, x0, forma_r):
+    S = 1
+    for valor, ndim in ((r, len(forma_r)), (disturbance, 2), (x0, 1)):
+        if valor is not None and np.ndim(valor) > ndim:
+            S = max(S, np.shape(valor)[0])
+    return max(S, np.size(r_w))
+
+
+def simulate(A, B, C, N_p, N_c, r_w, r, k_total, constraints=None, disturbance=None,
+             x0=None, u0=None, p_max=100, processes=None, basis=None):
+    """Simula o DMPC em malha fechada para S cenários.
+
+    A, B, C      modelo aumentado (augmented_system)
+    r_w          escalar ou array (S,) de pesos do controle
+    r            referência: escalar, (q,) ou (k_total, q) comum aos cenários,
+                 (S, k_total, q) ou (S, 1, q) por cenário; com q = 1 também
+                 (S,), um setpoint constante por cenário
+    constraints  (M, gamma0, S_u) de constraint_matrices, ou None
+    disturbance  perturbação somada ao estado, formato (S, k_total, n)
+    processes    se definido, divide os cenários entre processos
+    basis        base ΔU = L η (basis.py) comum a todos os cenários, ou None
+
+    Retorna SimulationResult com x (S, k_total, n), y (S, k_total, q),
+    du e u (S, k_total, m) e o número de iterações do QP (S, k_total).
+    """
+    n = A.shape[0]
+    m = B.shape[1]
+    q = C.shape[0]
+    r = _referencia(r, q)
+    S = _n_cenarios(r, r_w, disturbance, x0, (k_total, q))
+
+    try:
+        r = _por_cenario(r, S, (k_total, q))
+    except ValueError:
+        raise ValueError(f"Referência com formato {r.shape} incompatível com (S, k_total, q) = "
+                         f"{(S, k_total, q)}") from None
+    r_w = np.broadcast_to(np.asarray(r_w, dtype=np.float64), (S,))
+    d = None if disturbance is None else _por_cenario(disturbance, S, (k_total, n))
+    x0 = np.zeros((S, n)) if x0 is None else _por_cenario(x0, S, (n,))
+    u0 = np.zeros((S, m)) if u0 is None else _por_cenario(u0, S, (m,))
+
+    if processes and S > 1:
+        return _simulate_pool(A, B, C, N_p, N_c, r_w, r, k_total, constraints, d,
+                              x0, u0, p_max, processes, basis)
+
+    x = np.zeros((S, k_total, n))
+    du = np.zeros((S, k_total, m))
+    u = np.zeros((S, k_total, m))
+    iteracoes = np.zeros((S, k_total), dtype=int)
+    x[:, 0] = x0
+
+    controladores = [get_controller(A, B, C, N_p, N_c, w, basis=basis) for w in r_w]
+    Ky = np.stack([c.Ky for c in controladores])
+    Kx = np.stack([c.Kx for c in controladores])
+
+    if constraints is not None:
+        M, gamma0, S_u = constraints
+        solvers_rw = {}
+        solvers = []
+        for w, c in zip(r_w, controladores):
+            if w not in solvers_rw:
+                solvers_rw[w] = DMPCSolver(c, M, p_max=p_max)
+            # cada cenário tem o seu λ, mas H e E^-1 M' são compartilhadas
+            solver = copy.copy(solvers_rw[w])
+            solver.hildreth = copy.copy(solver.hildreth)
+            solver.hildreth.lambda_ = np.zeros_like(solver.hildreth.lambda_)
+            solvers.append(solver)
+
+    u_prev = u0.copy()
+    for k in range(k_total):
+        xk = x[:, k]
+        if constraints is None:
+            du[:, k] = np.einsum('smq,sq->sm', Ky, r[:, k]) - np.einsum('smn,sn->sm', Kx, xk)
+        else:
+            for s in range(S):
+                resultado = solvers[s].solve(xk[s], r[s, k], gamma0 + S_u @ u_prev[s])
+                du[s, k] = resultado.x[:m]
+                iteracoes[s, k] = resultado.iterations
+
+        u_prev += du[:, k]
+        u[:, k] = u_prev
+        if k + 1 < k_total:
+            x[:, k + 1] = xk @ A.T + du[:, k] @ B.T
+            if d is not None:
+                x[:, k + 1] += d[:, k]
+
+    y = x @ C.T
+    return SimulationResult(x, y, du, u, iteracoes)
+
+
+def _simulate_pool(A, B, C, N_p, N_c, r_w, r, k_total, constraints, d, x0, u0, p_max,
+                   processes, basis=None):
+    """Divide os cenários em blocos contíguos e simula cada bloco em um processo."""
+    S = r.shape[0]
+    blocos = np.array_split(np.arange(S), min(processes, S))
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futuros = [
+            executor.submit(simulate, A, B, C, N_p, N_c, r_w[b], r[b], k_total, constraints,
+                            None if d is None else d[b], x0[b], u0[b], p_max, basis=basis)
+            for b in blocos
+        ]
+        partes = [f.result() for f in futuros]
+    return SimulationResult(*(np.concatenate(campo) for campo in zip(*partes)))
@@ -0,0 +1,195 @@
+"""
+    Formulação esparsa (não condensada) do DMPC
+
+    Na forma condensada (core.DMPC) a trajetória de estados é eliminada e o
+    QP fica denso em ΔU: montar Phi, Phi'Phi e fatorar custa
+    O(N_p q (N_c m)^2 + (N_c m)^3), o que domina para horizontes longos e
+    plantas com muitas entradas. Aqui os estados continuam como variáveis,
+
+        min  sum_{k=1..N_p} |C x_k - r|^2 + r_w sum_{k=0..N_c-1} |Δu_k|^2
+        s.a. x_{k+1} = A x_k + B Δu_k   (Δu_k = 0 para k >= N_c)
+
+    e o custo cresce apenas linearmente com o horizonte:
+
+    - os ganhos (Ky, Kx) vêm da recursão de Riccati sobre o estado estendido
+      [x; r] (r constante no horizonte), O(N_p (n + q)^3);
+    - trajetórias ΔU e a hessiana reduzida E^-1 b (usada pelo Hildreth) vêm
+      de um sistema KKT esparso em banda, com as variáveis ordenadas por
+      instante [Δu_k, ν_k, x_{k+1}], fatorado uma vez (scipy.sparse, SuperLU).
+
+    choose_formulation() estima o custo de montagem das duas formulações e
+    get_controller(..., formulation='auto') escolhe a mais barata; F e Phi
+    continuam disponíveis (calculadas sob demanda) para o código que usa a
+    forma condensada. O ponto de troca foi medido com
+    benchmarks/bench_sparse.py.
+"""
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+from .core import DMPC, compute_FPhi
+from .profiling import timed
+
+# custo de um passo de Riccati frente às operações densas da forma condensada:
+# RICCATI_COST (n + q)^3 mais um custo fixo por passo (chamadas numpy), em
+# operações equivalentes (medidos em benchmarks/bench_sparse.py)
+RICCATI_COST = 4.0
+RICCATI_OVERHEAD = 1e5
+
+
+def choose_formulation(n, m, q, N_p, N_c):
+    """'condensed' ou 'sparse', pela estimativa de operações para montar o controlador."""
+    nu = N_c * m
+    condensada = N_p * q * n * n + N_p * q * nu * (nu + n + q) + nu ** 3 / 3
+    esparsa = N_p * (RICCATI_COST * (n + q) ** 3 + RICCATI_OVERHEAD)
+    return 'sparse' if esparsa < condensada else 'condensed'
+
+
+class SparseDMPC(DMPC):
+    """DMPC sem condensação: mesma interface de DMPC (Ky, Kx, delta_u, delta_U).
+
+    F, Phi e o sistema KKT só são calculados quando usados.
+    """
+
+    def __init__(self, A, B, C, N_p, N_c, r_w):
+        self.A = A
+        self.B = B
+        self.C = C
+        self.N_p = N_p
+        self.N_c = N_c
+        self.r_w = r_w
+        self.n = A.shape[0]
+        self.m = B.shape[1]
+        self.q = C.shape[0]
+        self.R_barra = r_w * np.eye(N_c * self.m)
+        self.R_s = np.tile(np.eye(self.q), (N_p, 1))
+        self.basis = None
+        self._FPhi = None
+        self._lu = None
+
+        self.Ky, self.Kx = self._riccati()
+
+    @timed('gains')
+    def _riccati(self):
+        """Ganho do primeiro movimento pela recursão de Riccati em [x; r].
+
+        V_k(xi) = xi' P_k xi, com P_{N_p} = Q_e = [C, -I]' [C, -I]. Para
+        k < N_c há otimização em Δu_k; para k >= N_c o estado apenas evolui.
+        """
+        n, q, m = self.n, self.q, self.m
+        Ce = np.hstack([self.C, -np.eye(q)])
+        Q_e = Ce.T @ Ce
+
+        # A_xi = blkdiag(A, I): os produtos com A_xi só alteram as linhas/colunas de x
+        P = Q_e.copy()
+        K = None
+        R = self.r_w * np.eye(m)
+        for k in range(self.N_p - 1, -1, -1):
+            if k < self.N_c:
+                PB = P[:, :n] @ self.B                 # P B_xi
+                BPA = PB.T.copy()                      # B_xi' P A_xi
+                BPA[:, :n] = BPA[:, :n] @ self.A
+                K = np.linalg.solve(R + self.B.T @ PB[:n], BPA)
+            P[:, :n] = P[:, :n] @ self.A               # A_xi' P A_xi
+            P[:n, :] = self.A.T @ P[:n, :]
+            if k < self.N_c:
+                P -= BPA.T @ K
+            if k >= 1:
+                P += Q_e
+            P += P.T                                   # simetria numérica
+            P *= 0.5
+        # Δu_0 = -K [x; r] = Ky r - Kx x
+        return -K[:, n:].copy(), K[:, :n].copy()
+
+    # --- sistema KKT esparso -------------------------------------------------
+
+    @timed('kkt')
+    def _montar_kkt(self):
+        """Fatora o sistema KKT em banda e guarda os índices de Δu, ν_0 e x_k."""
+        n, m, q, N_p, N_c = self.n, self.m, self.q, self.N_p, self.N_c
+        A, B = self.A, self.B
+        Q_x = 2 * self.C.T @ self.C
+
+        # posições de cada bloco na ordem [Δu_k, ν_k, x_{k+1}]
+        tamanho = N_p * 2 * n + N_c * m
+        pos_u, pos_nu, pos_x = [], [], []
+        p = 0
+        for k in range(N_p):
+            if k < N_c:
+                pos_u.append(p)
+                p += m
+            pos_nu.append(p)
+            pos_x.append(p + n)
+            p += 2 * n
+
+        linhas, colunas, valores = [], [], []
+
+        def bloco(i, j, M, simetrico=False):
+            ii, jj = np.nonzero(M)
+            linhas.append(i + ii)
+            colunas.append(j + jj)
+            valores.append(M[ii, jj])
+            if simetrico:
+                linhas.append(j + jj)
+                colunas.append(i + ii)
+                valores.append(M[ii, jj])
+
+        I = np.eye(n)
+        for k in range(N_p):
+            bloco(pos_x[k], pos_x[k], Q_x)
+            bloco(pos_nu[k], pos_x[k], I, simetrico=True)
+            if k >= 1:
+                bloco(pos_nu[k], pos_x[k - 1], -A, simetrico=True)
+            if k < N_c:
+                bloco(pos_u[k], pos_u[k], 2 * self.r_w * np.eye(m))
+                bloco(pos_nu[k], pos_u[k], -B, simetrico=True)
+
+        K = sparse.csc_matrix((np.concatenate(valores), (np.concatenate(linhas), np.concatenate(colunas))),
+                              shape=(tamanho, tamanho))
+        # a ordem por instante já deixa a matriz em banda
+        self._lu = splu(K, permc_spec='NATURAL')
+        self._tamanho = tamanho
+        self._iu = (np.asarray(pos_u)[:, None] + np.arange(m)).ravel()
+        self._inu0 = pos_nu[0] + np.arange(n)
+        self._ix = (np.asarray(pos_x)[:, None] + np.arange(n)).ravel()
+
+    def _kkt(self, rhs_u=None, rhs_nu0=None, rhs_x=None):
+        """Resolve o KKT e retorna a parte Δu da solução (formato (N_c m, ...))."""
+        if self._lu is None:
+            self._montar_kkt()
+        forma = next(np.shape(v)[1:] for v in (rhs_u, rhs_nu0, rhs_x) if v is not None)
+        rhs = np.zeros((self._tamanho,) + forma)
+        if rhs_u is not None:
+            rhs[self._iu] = rhs_u
+        if rhs_nu0 is not None:
+            rhs[self._inu0] = rhs_nu0
+        if rhs_x is not None:
+            rhs[self._ix] = rhs_x
+        return self._lu.solve(rhs.reshape(self._tamanho, -1)).reshape(rhs.shape)[self._iu]
+
+    def delta_U(self, x, r):
+        """Trajetória ótima ΔU completa no horizonte de controle."""
+        x = np.asarray(x, dtype=np.float64)
+        r = self._referencia(x, r)
+        # ν_0: x_1 - B Δu_0 = A x(k);  linhas de x_k: 2 C' r
+        return self._kkt(rhs_nu0=self.A @ x, rhs_x=np.tile(2 * self.C.T @ r, (self.N_p,) + (1,) * (r.ndim - 1)))
+
+    def solve_hessian(self, b):
+        """E^-1 b, com E = 2 (Phi'Phi + R_barra) a hessiana do QP em ΔU."""
+        return self._kkt(rhs_u=np.asarray(b, dtype=np.float64))
+
+    # --- forma condensada sob demanda ---------------------------------------
+
+    def _condensada(self):
+        if self._FPhi is None:
+            self._FPhi = compute_FPhi(self.A, self.B, self.C, self.N_p, self.N_c)
+        return self._FPhi
+
+    @property
+    def F(self):
+        return self._condensada()[0]
+
+    @property
+    def Phi(self):
+        return self._condensada()[1]
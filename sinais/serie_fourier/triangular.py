@@ -1,5 +1,11 @@
 # Calculo dos coeficientes da série de Fourier para um sinal triangular não simétrico
 # parametrizado pelo tempo de subida, e período
+#
+# Os coeficientes são calculados para um vetor de ordens de uma só vez e a
+# síntese de N harmônicos em M instantes é uma única operação matricial
+# (M x N) ou uma FFT inversa para um período uniformemente amostrado.
+# oscillator_bank() fornece o mesmo sinal como um banco de osciladores em
+# espaço de estados, para aumentar o modelo da planta no MPC.
 
 import math
 import numpy as np
@@ -7,15 +13,22 @@ import numpy as np
 def compute_mean(ts, T, n):
     return 0.5
 
-def compute_coef(n : int, ts : float, T : float):
-    if n == 0:
+def compute_coef(n, ts : float, T : float):
+    """Coeficientes (a_n, b_n) das ordens n (inteiro ou vetor de inteiros).
+
+    Para n inteiro igual a 0 retorna a média, 0.5. Para um vetor de ordens,
+    a posição de n = 0 recebe a_0 = 0.5 e b_0 = 0.
+    """
+    if np.ndim(n) == 0 and n == 0:
         return 0.5
     # k = T**2 / (2*(T-ts)*ts*(math.pi*n)**2)
     pi =  np.pi
     cos = np.cos
     sin = np.sin
 
-    omega_n = 2*pi*n/T
+    n = np.asarray(n, dtype=float)
+    nulo = n == 0
+    omega_n = 2*pi*np.where(nulo, 1.0, n)/T
     k = 2 / T / (omega_n ** 2)
 
     a_n1 = cos(omega_n*ts) - 1
@@ -30,8 +43,73 @@ def compute_coef(n : int, ts : float, T : float):
     # a_n = k * (math.cos(2*math.pi*n*ts/T) - 1)
 
     # b_n = k * (math.sin(2*math.pi*n*ts/T) - 1)
-    return a_n, b_n
+    if n.ndim == 0:
+        return float(a_n), float(b_n)
+    return np.where(nulo, 0.5, a_n), np.where(nulo, 0.0, b_n)
 
 def triangular(ts, T, n_max):
-    
-    map(compute_coef, range(0, n_max+1))
\ No newline at end of file
+    """Coeficientes (a_n, b_n) das ordens 1..n_max."""
+    return compute_coef(np.arange(1, n_max+1), ts, T)
+
+def synthesize(t, a_n, b_n, T, a_0=0.0, n=None):
+    """Avalia a_0 + sum a_n cos(w_n t) + b_n sin(w_n t) nos instantes t.
+
+    n: ordens dos coeficientes (padrão 1..N). Os N harmônicos nos M
+    instantes são calculados em uma única matriz M x N.
+    """
+    a_n = np.asarray(a_n, dtype=float)
+    b_n = np.asarray(b_n, dtype=float)
+    n = np.arange(1, len(a_n)+1) if n is None else np.asarray(n)
+    arg = np.multiply.outer(np.asarray(t, dtype=float), 2*np.pi*n/T)
+    return a_0 + np.cos(arg) @ a_n + np.sin(arg) @ b_n
+
+def synthesize_fft(a_n, b_n, M, a_0=0.0):
+    """Um período do sinal amostrado em M pontos (t_k = k T / M) por FFT inversa.
+
+    Os coeficientes são das ordens 1..N, com N < M / 2.
+    """
+    N = len(a_n)
+    if 2*N >= M:
+        raise ValueError(f"M = {M} pontos não representa {N} harmônicos (requer M > 2N)")
+    X = np.zeros(M//2 + 1, dtype=complex)
+    X[0] = M * a_0
+    X[1:N+1] = 0.5 * M * (np.asarray(a_n) - 1j*np.asarray(b_n))
+    return np.fft.irfft(X, n=M)
+
+def oscillator_bank(a_n, b_n, T, Ts=None, a_0=None):
+    """Modelo em espaço de estados do sinal periódico: x(k+1) = A x(k), d(k) = C x(k).
+
+    Cada harmônico n é um oscilador de 2 estados (rotação de w_n = 2 pi n / T);
+    com a_0 um estado constante adicional representa a média. Retorna
+    (A, C, x0), com x0 tal que d(0) reproduz a série em t = 0. Com Ts = None
+    o modelo é contínuo (dx/dt = A x); caso contrário a discretização é exata.
+
+    Para uma perturbação na saída da planta (A_m, B_m, C_m):
+        A = blkdiag(A_m, A_d),  B = [B_m; 0],  C = [C_m  C_d]
+    """
+    a_n = np.asarray(a_n, dtype=float)
+    b_n = np.asarray(b_n, dtype=float)
+    N = len(a_n)
+    w = 2*np.pi*np.arange(1, N+1)/T
+
+    # p' = -w q, q' = w p  =>  p(t) = p0 cos(wt) - q0 sin(wt);  p0 = a_n, q0 = -b_n
+    n_x = 2*N + (a_0 is not None)
+    A = np.zeros((n_x, n_x))
+    C = np.zeros((1, n_x))
+    x0 = np.zeros(n_x)
+    p = np.arange(0, 2*N, 2)
+    if Ts is None:
+        A[p, p+1] = -w
+        A[p+1, p] = w
+    else:
+        c, s = np.cos(w*Ts), np.sin(w*Ts)
+        A[p, p], A[p, p+1] = c, -s
+        A[p+1, p], A[p+1, p+1] = s, c
+    C[0, p] = 1.0
+    x0[p], x0[p+1] = a_n, -b_n
+
+    if a_0 is not None:
+        A[-1, -1] = 0.0 if Ts is None else 1.0
+        C[0, -1] = 1.0
+        x0[-1] = a_0
+    return A, C, x0